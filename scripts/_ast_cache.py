@@ -0,0 +1,101 @@
+"""
+Cache de AST em disco para o analisador de código VEO
+Armazena objetos ast.Module serializados, indexados pelo SHA256 do código-fonte
+"""
+
+import ast
+import hashlib
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Incremente quando a forma como a AST é consumida mudar, invalidando o cache
+ANALYZER_VERSION = 1
+
+CACHE_DIR = Path(__file__).parent.parent / 'source-ast-cache'
+
+
+def cache_key(src_bytes: bytes) -> str:
+    """Gera a chave do cache a partir do conteúdo e da versão do Python"""
+    digest = hashlib.sha256(src_bytes).hexdigest()[:16]
+    return f"{digest}_{sys.version_info.major}{sys.version_info.minor}_v{ANALYZER_VERSION}"
+
+
+def load(src_bytes: bytes) -> Optional[ast.Module]:
+    """Carrega a AST do cache, ou None se não existir ou estiver corrompida"""
+    cache_file = CACHE_DIR / f"{cache_key(src_bytes)}.pickle"
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def store(src_bytes: bytes, tree: ast.Module) -> None:
+    """Salva a AST no cache (escrita atômica via arquivo temporário)"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_file = CACHE_DIR / f"{cache_key(src_bytes)}.pickle"
+    tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+
+
+# Índice do modo incremental: caminho -> (mtime_ns, tamanho, chave das estatísticas)
+INDEX_FILE = Path(__file__).parent / '.codeanalysis-index.json'
+
+
+def load_index() -> Dict[str, Dict[str, Any]]:
+    """Carrega o índice da execução anterior (vazio se ausente ou de outra versão)"""
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get('version') != ANALYZER_VERSION:
+        return {}
+    return index.get('files', {})
+
+
+def save_index(files: Dict[str, Dict[str, Any]]) -> None:
+    """Persiste o índice do modo incremental"""
+    tmp_file = INDEX_FILE.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': ANALYZER_VERSION, 'files': files}, f, indent=2)
+        os.replace(tmp_file, INDEX_FILE)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+
+
+def stats_key(path: str, mtime_ns: int, size: int) -> str:
+    """Chave das estatísticas parciais de um arquivo em um dado estado"""
+    return hashlib.sha256(f"{path}:{mtime_ns}:{size}".encode('utf-8')).hexdigest()[:16]
+
+
+def load_stats(key: str) -> Optional[Any]:
+    """Carrega as estatísticas parciais salvas, ou None se indisponíveis"""
+    try:
+        with open(CACHE_DIR / f"stats_{key}.pkl", 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def store_stats(key: str, partial: Any) -> None:
+    """Salva as estatísticas parciais de um arquivo"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    stats_file = CACHE_DIR / f"stats_{key}.pkl"
+    tmp_file = stats_file.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(partial, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, stats_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
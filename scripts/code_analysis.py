@@ -4,14 +4,23 @@ Script de Análise de Código VEO
 Analisa o código real do projeto e gera relatórios baseados no estado atual
 """
 
+import argparse
+import ast
 import os
 import re
+import sys
 import json
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-from collections import defaultdict
+from typing import Dict, Iterator, List, Any, Optional, Set
+from dataclasses import dataclass, field, fields
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, partial
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import _ast_cache
 
 # Cores para output
 class Colors:
@@ -33,8 +42,23 @@ CONFIG = {
     'max_file_size': 500,  # linhas
     'max_function_length': 50,  # linhas
     'max_class_length': 200,  # linhas
+    'parallel_threshold': 32,  # arquivos; abaixo disso o pool não compensa
 }
 
+TRACKED_IMPORTS = frozenset({'google', 'torch', 'pandas', 'numpy'})
+EXCLUDE_DIRS = frozenset(CONFIG['exclude_dirs'])
+FILE_EXTENSIONS = tuple(CONFIG['file_extensions'])
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+DOC_MARKERS = frozenset({'"""', "'''", '# TODO', '# FIXME'})
+
+DEP_SPLIT_RE = re.compile(r'[=<>!~]')
+
+# Palavras-chave de problemas, encontradas em uma única varredura do conteúdo
+ISSUE_KEYWORDS = ('console.print(', 'print(', 'eval(', 'exec(') + tuple(DOC_MARKERS)
+ISSUE_KEYWORDS_RE = re.compile('|'.join(
+    re.escape(keyword) for keyword in sorted(ISSUE_KEYWORDS, key=len, reverse=True)
+))
+
 @dataclass
 class Issue:
     file: str
@@ -42,53 +66,299 @@ class Issue:
     suggestion: str
     severity: str = 'warning'
 
+def _iter_py_files(root: str, exclude: frozenset, exts: tuple,
+                   subdirs: Optional[Counter] = None) -> Iterator[str]:
+    """Percorre o diretório com os.scandir, aproveitando o tipo já lido de cada entrada.
+    Se subdirs for informado, conta os subdiretórios visitados de cada diretório."""
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in exclude:
+                if subdirs is not None:
+                    subdirs[root] += 1
+                yield from _iter_py_files(entry.path, exclude, exts, subdirs)
+        elif entry.name.endswith(exts) and entry.is_file():
+            yield entry.path
+
+class _Mergeable:
+    """Soma campo a campo (contadores, Counters e listas) de dois agregados"""
+    __slots__ = ()
+
+    def merge(self, other: '_Mergeable') -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+@dataclass(slots=True)
+class FileStats(_Mergeable):
+    total: int = 0
+    by_type: Counter = field(default_factory=Counter)
+    by_size: Counter = field(default_factory=Counter)
+
+@dataclass(slots=True)
+class ClassStats(_Mergeable):
+    total: int = 0
+    with_docstrings: int = 0
+    with_type_hints: int = 0
+    with_async_methods: int = 0
+
+@dataclass(slots=True)
+class FunctionStats(_Mergeable):
+    total: int = 0
+    long: int = 0
+    with_docstrings: int = 0
+    with_type_hints: int = 0
+    async_: int = 0
+
+@dataclass(slots=True)
+class ImportStats(_Mergeable):
+    google: int = 0
+    torch: int = 0
+    pandas: int = 0
+    numpy: int = 0
+    external: int = 0
+    internal: int = 0
+
+ISSUE_CATEGORIES = ('naming', 'performance', 'security', 'structure', 'documentation')
+
+@dataclass(slots=True)
+class IssueBuckets(_Mergeable):
+    naming: List[Issue] = field(default_factory=list)
+    performance: List[Issue] = field(default_factory=list)
+    security: List[Issue] = field(default_factory=list)
+    structure: List[Issue] = field(default_factory=list)
+    documentation: List[Issue] = field(default_factory=list)
+    counts: Counter = field(default_factory=Counter)
+
+    def add(self, category: str, issue: Issue) -> None:
+        """Registra um problema mantendo a contagem por categoria"""
+        getattr(self, category).append(issue)
+        self.counts[category] += 1
+
+    def categories(self) -> List[tuple]:
+        return [(category, getattr(self, category)) for category in ISSUE_CATEGORIES]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+@dataclass(slots=True)
+class Stats(_Mergeable):
+    """Agregado de todas as estatísticas coletadas"""
+    files: FileStats = field(default_factory=FileStats)
+    classes: ClassStats = field(default_factory=ClassStats)
+    functions: FunctionStats = field(default_factory=FunctionStats)
+    imports: ImportStats = field(default_factory=ImportStats)
+    issues: IssueBuckets = field(default_factory=IssueBuckets)
+
+    def merge(self, other: 'Stats') -> None:
+        for f in fields(self):
+            getattr(self, f.name).merge(getattr(other, f.name))
+
+class ASTVisitor(ast.NodeVisitor):
+    """Percorre a AST uma única vez coletando classes, funções e imports"""
+
+    def __init__(self, stats: Stats):
+        self.stats = stats
+        self.max_function_length = CONFIG['max_function_length']
+
+    @staticmethod
+    def has_type_hints(node: ast.AST) -> bool:
+        """Verifica se a função possui anotação de retorno ou de argumentos"""
+        if node.returns is not None:
+            return True
+        args = node.args
+        all_args = args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+        return any(arg is not None and arg.annotation is not None for arg in all_args)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        classes = self.stats.classes
+        methods = [n for n in node.body if isinstance(n, FUNCTION_NODES)]
+        classes.total += 1
+        classes.with_docstrings += ast.get_docstring(node) is not None
+        classes.with_type_hints += (any(self.has_type_hints(m) for m in methods)
+                                    or any(isinstance(n, ast.AnnAssign) for n in node.body))
+        classes.with_async_methods += any(isinstance(m, ast.AsyncFunctionDef) for m in methods)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        functions = self.stats.functions
+        functions.total += 1
+        functions.async_ += isinstance(node, ast.AsyncFunctionDef)
+        functions.with_docstrings += ast.get_docstring(node) is not None
+        functions.with_type_hints += self.has_type_hints(node)
+        functions.long += node.end_lineno - node.lineno > self.max_function_length
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def count_import(self, category: str) -> None:
+        imports = self.stats.imports
+        setattr(imports, category, getattr(imports, category) + 1)
+
+    @staticmethod
+    def import_category(module: str) -> str:
+        package = module.split('.')[0]
+        return package if package in TRACKED_IMPORTS else 'external'
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.count_import(self.import_category(alias.name))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        self.count_import('internal' if node.level > 0 else self.import_category(node.module or ''))
+
+@dataclass
+class PartialStats:
+    """Resultado da análise de um único arquivo, devolvido ao processo principal"""
+    file: str
+    stats: Stats
+    cache_hits: int = 0
+    cache_misses: int = 0
+    error: Optional[str] = None
+
+def parse_source(src_bytes: bytes, content: str, file_path: str,
+                 use_cache: bool, result: PartialStats) -> ast.Module:
+    """Retorna a AST do arquivo, reutilizando o cache em disco quando possível"""
+    if use_cache:
+        tree = _ast_cache.load(src_bytes)
+        if tree is not None:
+            result.cache_hits += 1
+            return tree
+        result.cache_misses += 1
+    
+    tree = ast.parse(content, filename=file_path)
+    
+    if use_cache:
+        _ast_cache.store(src_bytes, tree)
+    return tree
+
+def scan_keywords(content: str) -> Set[str]:
+    """Retorna as palavras-chave de ISSUE_KEYWORDS presentes no conteúdo"""
+    found = set()
+    for match in ISSUE_KEYWORDS_RE.finditer(content):
+        found.add(match.group())
+        if len(found) == len(ISSUE_KEYWORDS):
+            break
+    return found
+
+def analyze_issues(stats: Stats, found: Set[str], file_path: str, line_count: int) -> None:
+    """Analisa problemas no código a partir das palavras-chave já encontradas"""
+    file_name = os.path.basename(file_path)
+    has_print = 'print(' in found and 'console.print(' not in found and 'test' not in file_path
+    has_eval = 'eval(' in found or 'exec(' in found
+    has_docs = not DOC_MARKERS.isdisjoint(found)
+    
+    # Problemas de nomenclatura
+    if file_name != file_name.lower() and not file_name.startswith('__'):
+        stats.issues.add('naming', Issue(
+            file=file_path,
+            issue='Nome de arquivo não segue snake_case',
+            suggestion='Renomeie para snake_case (ex: my_module.py)'
+        ))
+    
+    # Problemas de performance
+    if has_print:
+        stats.issues.add('performance', Issue(
+            file=file_path,
+            issue='print() encontrado em código de produção',
+            suggestion='Use o sistema de logging apropriado'
+        ))
+    
+    # Problemas de segurança
+    if has_eval:
+        stats.issues.add('security', Issue(
+            file=file_path,
+            issue='Uso de eval() ou exec() detectado',
+            suggestion='Evite eval() e exec() por questões de segurança'
+        ))
+    
+    # Problemas de estrutura
+    if line_count > CONFIG['max_file_size']:
+        stats.issues.add('structure', Issue(
+            file=file_path,
+            issue=f'Arquivo muito grande ({line_count} linhas)',
+            suggestion='Considere quebrar em arquivos menores'
+        ))
+    
+    # Problemas de documentação
+    if not has_docs:
+        stats.issues.add('documentation', Issue(
+            file=file_path,
+            issue='Falta de documentação',
+            suggestion='Adicione docstrings e comentários'
+        ))
+
+def _analyze_one(file_path: str, use_cache: bool = True) -> PartialStats:
+    """Analisa um arquivo Python sem estado compartilhado (seguro para processos)"""
+    stats = Stats()
+    result = PartialStats(file=file_path, stats=stats)
+    try:
+        with open(file_path, 'rb') as f:
+            src_bytes = f.read()
+        content = src_bytes.decode('utf-8')
+        
+        tree = parse_source(src_bytes, content, file_path, use_cache, result)
+        
+        file_name = os.path.basename(file_path)
+        file_type = os.path.splitext(file_name)[1]
+        
+        # Classificar por tamanho
+        line_count = content.count('\n') + (not content.endswith('\n'))
+        if line_count < 50:
+            size = 'small'
+        elif line_count < 200:
+            size = 'medium'
+        elif line_count < 500:
+            size = 'large'
+        else:
+            size = 'xlarge'
+        
+        stats.files.total += 1
+        stats.files.by_type[file_type] += 1
+        stats.files.by_size[size] += 1
+        
+        # Análise específica (classes, funções e imports em uma única passada)
+        ASTVisitor(stats).visit(tree)
+        analyze_issues(stats, scan_keywords(content), file_path, line_count)
+        
+    except Exception as e:
+        result.error = str(e)
+    
+    return result
+
 class CodeAnalyzer:
-    def __init__(self):
-        self.stats = {
-            'files': {
-                'total': 0,
-                'by_type': defaultdict(int),
-                'by_size': {'small': 0, 'medium': 0, 'large': 0, 'xlarge': 0}
-            },
-            'classes': {
-                'total': 0,
-                'with_docstrings': 0,
-                'with_type_hints': 0,
-                'with_async_methods': 0
-            },
-            'functions': {
-                'total': 0,
-                'long': 0,
-                'with_docstrings': 0,
-                'with_type_hints': 0,
-                'async': 0
-            },
-            'imports': {
-                'google': 0,
-                'torch': 0,
-                'pandas': 0,
-                'numpy': 0,
-                'external': 0,
-                'internal': 0
-            },
-            'issues': {
-                'naming': [],
-                'performance': [],
-                'security': [],
-                'structure': [],
-                'documentation': []
-            }
-        }
+    def __init__(self, use_cache: bool = True, incremental: bool = False, full: bool = False):
+        self.use_cache = use_cache
+        self.incremental = incremental
+        self.full = full
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.stats = Stats()
+        self.subdirs = Counter()
+        self.structure = {}
+        self._buf: List[str] = []
 
     def log(self, message: str, color: str = 'white') -> None:
-        """Log com cores"""
+        """Log com cores (acumulado em buffer até flush())"""
         color_code = getattr(Colors, color.upper(), Colors.WHITE)
-        print(f"{color_code}{message}{Colors.RESET}")
+        self._buf.append(f"{color_code}{message}{Colors.RESET}")
 
     def log_section(self, title: str) -> None:
         """Log de seção com formatação"""
-        print(f"\n{Colors.CYAN}{Colors.BOLD}{title}{Colors.RESET}")
-        print(f"{Colors.YELLOW}{'=' * len(title)}{Colors.RESET}")
+        self._buf.append(f"\n{Colors.CYAN}{Colors.BOLD}{title}{Colors.RESET}")
+        self._buf.append(f"{Colors.YELLOW}{'=' * len(title)}{Colors.RESET}")
+
+    def flush(self) -> None:
+        """Escreve todo o buffer no stdout em uma única chamada"""
+        if self._buf:
+            sys.stdout.write('\n'.join(self._buf))
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+            self._buf.clear()
 
     def log_success(self, message: str) -> None:
         self.log(f"✓ {message}", 'green')
@@ -97,216 +367,105 @@ class CodeAnalyzer:
         self.log(f"⚠ {message}", 'yellow')
 
     def log_error(self, message: str) -> None:
-        self.log(f"✗ {message}", 'red')
+        """Erros vão direto para o stderr, sem esperar o buffer"""
+        sys.stderr.write(f"{Colors.RED}✗ {message}{Colors.RESET}\n")
+        sys.stderr.flush()
 
     def get_all_files(self, directory: str) -> List[str]:
         """Recupera todos os arquivos Python do diretório"""
-        files = []
-        
-        for root, dirs, filenames in os.walk(directory):
-            # Remove diretórios excluídos
-            dirs[:] = [d for d in dirs if d not in CONFIG['exclude_dirs']]
-            
-            for filename in filenames:
-                if any(filename.endswith(ext) for ext in CONFIG['file_extensions']):
-                    files.append(os.path.join(root, filename))
-        
-        return files
+        return list(_iter_py_files(directory, EXCLUDE_DIRS, FILE_EXTENSIONS, self.subdirs))
 
     def analyze_file(self, file_path: str) -> None:
         """Analisa um arquivo Python"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            file_name = os.path.basename(file_path)
-            file_type = os.path.splitext(file_name)[1]
-            
-            self.stats['files']['total'] += 1
-            self.stats['files']['by_type'][file_type] += 1
-            
-            # Classificar por tamanho
-            line_count = len(lines)
-            if line_count < 50:
-                self.stats['files']['by_size']['small'] += 1
-            elif line_count < 200:
-                self.stats['files']['by_size']['medium'] += 1
-            elif line_count < 500:
-                self.stats['files']['by_size']['large'] += 1
-            else:
-                self.stats['files']['by_size']['xlarge'] += 1
-            
-            # Análise específica
-            self.analyze_classes(content, file_path)
-            self.analyze_functions(content, file_path)
-            self.analyze_imports(content)
-            self.analyze_issues(content, file_path, line_count)
-            
-        except Exception as e:
-            self.log_error(f"Erro ao analisar {file_path}: {str(e)}")
+        self.merge(_analyze_one(file_path, self.use_cache))
 
-    def analyze_classes(self, content: str, file_path: str) -> None:
-        """Analisa classes Python"""
-        class_pattern = r'^class\s+(\w+).*:'
-        classes = re.findall(class_pattern, content, re.MULTILINE)
+    def analyze_files(self, files: List[str]) -> Iterator[PartialStats]:
+        """Analisa os arquivos, em paralelo quando a quantidade compensa o pool"""
+        if len(files) < CONFIG['parallel_threshold']:
+            for file_path in files:
+                yield _analyze_one(file_path, self.use_cache)
+            return
         
-        for class_name in classes:
-            self.stats['classes']['total'] += 1
-            
-            # Verificar docstring
-            if f'class {class_name}' in content:
-                class_start = content.find(f'class {class_name}')
-                class_section = content[class_start:class_start + 500]
-                if '"""' in class_section or "'''" in class_section:
-                    self.stats['classes']['with_docstrings'] += 1
-            
-            # Verificar type hints
-            if '->' in content or ':' in content:
-                self.stats['classes']['with_type_hints'] += 1
-            
-            # Verificar métodos async
-            if 'async def' in content:
-                self.stats['classes']['with_async_methods'] += 1
-
-    def analyze_functions(self, content: str, file_path: str) -> None:
-        """Analisa funções Python"""
-        function_pattern = r'^def\s+(\w+).*:'
-        functions = re.findall(function_pattern, content, re.MULTILINE)
+        chunksize = max(1, len(files) // (4 * (os.cpu_count() or 1)))
+        worker = partial(_analyze_one, use_cache=self.use_cache)
+        with ProcessPoolExecutor() as executor:
+            yield from executor.map(worker, files, chunksize=chunksize)
+
+    def analyze_incremental(self, files: List[str]) -> Dict[str, PartialStats]:
+        """Reaproveita estatísticas de arquivos inalterados desde a última execução"""
+        index = {} if self.full else _ast_cache.load_index()
+        new_index = {}
+        results = {}
+        pending = []
         
-        for func_name in functions:
-            self.stats['functions']['total'] += 1
-            
-            # Verificar se é async
-            if f'async def {func_name}' in content:
-                self.stats['functions']['async'] += 1
-            
-            # Verificar docstring
-            if f'def {func_name}' in content:
-                func_start = content.find(f'def {func_name}')
-                func_section = content[func_start:func_start + 200]
-                if '"""' in func_section or "'''" in func_section:
-                    self.stats['functions']['with_docstrings'] += 1
-            
-            # Verificar type hints
-            if '->' in content or ':' in content:
-                self.stats['functions']['with_type_hints'] += 1
+        for file_path in files:
+            st = os.stat(file_path)
+            key = _ast_cache.stats_key(file_path, st.st_mtime_ns, st.st_size)
+            new_index[file_path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'stats': key}
             
-            # Verificar se é muito longa
-            if self.get_function_length(content, func_name) > CONFIG['max_function_length']:
-                self.stats['functions']['long'] += 1
-
-    def get_function_length(self, content: str, func_name: str) -> int:
-        """Calcula o comprimento de uma função"""
-        pattern = rf'^def\s+{func_name}.*:\n(.*?)(?=^def|\Z)'
-        match = re.search(pattern, content, re.MULTILINE | re.DOTALL)
-        if match:
-            return len(match.group(1).split('\n'))
-        return 0
-
-    def analyze_imports(self, content: str) -> None:
-        """Analisa imports"""
-        import_lines = [line for line in content.split('\n') if line.strip().startswith('import') or line.strip().startswith('from')]
-        
-        for line in import_lines:
-            if 'google' in line:
-                self.stats['imports']['google'] += 1
-            elif 'torch' in line:
-                self.stats['imports']['torch'] += 1
-            elif 'pandas' in line:
-                self.stats['imports']['pandas'] += 1
-            elif 'numpy' in line:
-                self.stats['imports']['numpy'] += 1
-            elif 'from ..' in line or 'from .' in line:
-                self.stats['imports']['internal'] += 1
+            entry = index.get(file_path)
+            if entry == new_index[file_path]:
+                cached = _ast_cache.load_stats(key)
+                if cached is not None:
+                    cached.cache_hits = cached.cache_misses = 0
+                    results[file_path] = cached
+                    continue
+            pending.append(file_path)
+        
+        for result in self.analyze_files(pending):
+            results[result.file] = result
+            if result.error is None:
+                _ast_cache.store_stats(new_index[result.file]['stats'], result)
             else:
-                self.stats['imports']['external'] += 1
-
-    def analyze_issues(self, content: str, file_path: str, line_count: int) -> None:
-        """Analisa problemas no código"""
-        file_name = os.path.basename(file_path)
-        
-        # Problemas de nomenclatura
-        if file_name != file_name.lower() and not file_name.startswith('__'):
-            self.stats['issues']['naming'].append(Issue(
-                file=file_path,
-                issue='Nome de arquivo não segue snake_case',
-                suggestion='Renomeie para snake_case (ex: my_module.py)'
-            ))
-        
-        # Problemas de performance
-        if 'print(' in content and 'console.print(' not in content and 'test' not in file_path:
-            self.stats['issues']['performance'].append(Issue(
-                file=file_path,
-                issue='print() encontrado em código de produção',
-                suggestion='Use o sistema de logging apropriado'
-            ))
+                del new_index[result.file]
         
-        # Problemas de segurança
-        if 'eval(' in content or 'exec(' in content:
-            self.stats['issues']['security'].append(Issue(
-                file=file_path,
-                issue='Uso de eval() ou exec() detectado',
-                suggestion='Evite eval() e exec() por questões de segurança'
-            ))
-        
-        # Problemas de estrutura
-        if line_count > CONFIG['max_file_size']:
-            self.stats['issues']['structure'].append(Issue(
-                file=file_path,
-                issue=f'Arquivo muito grande ({line_count} linhas)',
-                suggestion='Considere quebrar em arquivos menores'
-            ))
+        _ast_cache.save_index(new_index)
+        self.log(f"Modo incremental: {len(files) - len(pending)} reaproveitados, {len(pending)} reanalisados", 'cyan')
+        return results
+
+    def merge(self, result: PartialStats) -> None:
+        """Incorpora o resultado parcial de um arquivo às estatísticas globais"""
+        if result.error is not None:
+            self.log_error(f"Erro ao analisar {result.file}: {result.error}")
+            return
         
-        # Problemas de documentação
-        if not any(keyword in content for keyword in ['"""', "'''", '# TODO', '# FIXME']):
-            self.stats['issues']['documentation'].append(Issue(
-                file=file_path,
-                issue='Falta de documentação',
-                suggestion='Adicione docstrings e comentários'
-            ))
-
-    def analyze_dependencies(self) -> Optional[Dict[str, Any]]:
-        """Analisa dependências do requirements.txt"""
+        self.stats.merge(result.stats)
+        self.cache_stats['hits'] += result.cache_hits
+        self.cache_stats['misses'] += result.cache_misses
+
+    @cached_property
+    def dependencies(self) -> Optional[Dict[str, Any]]:
+        """Analisa dependências do requirements.txt (lido uma única vez)"""
         try:
             with open('requirements.txt', 'r') as f:
                 content = f.read()
             
-            dependencies = [line.split('==')[0].split('>=')[0].split('<=')[0] 
-                          for line in content.split('\n') if line.strip() and not line.startswith('#')]
+            dependencies = [DEP_SPLIT_RE.split(line, 1)[0].strip()
+                            for line in content.split('\n') if line.strip() and not line.startswith('#')]
+            techs = {tech for tech in TRACKED_IMPORTS for dep in dependencies if tech in dep}
             
             return {
                 'total': len(dependencies),
-                'google': any('google' in dep for dep in dependencies),
-                'torch': any('torch' in dep for dep in dependencies),
-                'pandas': any('pandas' in dep for dep in dependencies),
-                'numpy': any('numpy' in dep for dep in dependencies),
+                'google': 'google' in techs,
+                'torch': 'torch' in techs,
+                'pandas': 'pandas' in techs,
+                'numpy': 'numpy' in techs,
                 'dependencies': dependencies
             }
         except FileNotFoundError:
             self.log_error("requirements.txt não encontrado")
             return None
 
-    def analyze_structure(self) -> Dict[str, Any]:
-        """Analisa estrutura de diretórios"""
-        structure = {}
-        
-        for root, dirs, files in os.walk('.'):
-            if any(exclude in root for exclude in CONFIG['exclude_dirs']):
-                continue
-            
-            rel_path = os.path.relpath(root, '.')
-            if rel_path == '.':
-                continue
-            
-            py_files = [f for f in files if f.endswith('.py')]
-            if py_files:
-                structure[rel_path] = {
-                    'files': len(py_files),
-                    'directories': len(dirs)
-                }
-        
-        return structure
+    def analyze_structure(self, files: List[str]) -> Dict[str, Any]:
+        """Analisa estrutura de diretórios a partir da lista de arquivos já percorrida"""
+        file_counts = Counter(os.path.dirname(f) for f in files)
+        return {
+            os.path.relpath(directory, '.'): {
+                'files': count,
+                'directories': self.subdirs[directory]
+            }
+            for directory, count in file_counts.items()
+        }
 
     def generate_report(self) -> None:
         """Gera relatório completo"""
@@ -320,60 +479,61 @@ class CodeAnalyzer:
         self.report_structure()
         self.report_issues()
         self.report_recommendations()
+        self.flush()
 
     def report_files(self) -> None:
         """Relatório de arquivos"""
         self.log_section('📁 ARQUIVOS')
-        self.log(f"Total de arquivos analisados: {self.stats['files']['total']}", 'white')
+        self.log(f"Total de arquivos analisados: {self.stats.files.total}", 'white')
         
         self.log('\nPor tipo:', 'yellow')
-        for file_type, count in self.stats['files']['by_type'].items():
+        for file_type, count in self.stats.files.by_type.items():
             self.log(f"  {file_type}: {count}", 'cyan')
         
         self.log('\nPor tamanho:', 'yellow')
-        self.log(f"  Pequenos (<50 linhas): {self.stats['files']['by_size']['small']}", 'green')
-        self.log(f"  Médios (50-200 linhas): {self.stats['files']['by_size']['medium']}", 'yellow')
-        self.log(f"  Grandes (200-500 linhas): {self.stats['files']['by_size']['large']}", 'orange')
-        self.log(f"  Muito grandes (>500 linhas): {self.stats['files']['by_size']['xlarge']}", 'red')
+        self.log(f"  Pequenos (<50 linhas): {self.stats.files.by_size['small']}", 'green')
+        self.log(f"  Médios (50-200 linhas): {self.stats.files.by_size['medium']}", 'yellow')
+        self.log(f"  Grandes (200-500 linhas): {self.stats.files.by_size['large']}", 'orange')
+        self.log(f"  Muito grandes (>500 linhas): {self.stats.files.by_size['xlarge']}", 'red')
 
     def report_classes(self) -> None:
         """Relatório de classes"""
         self.log_section('🏗️ CLASSES')
-        self.log(f"Total de classes: {self.stats['classes']['total']}", 'white')
-        self.log(f"Com docstrings: {self.stats['classes']['with_docstrings']}", 'cyan')
-        self.log(f"Com type hints: {self.stats['classes']['with_type_hints']}", 'cyan')
-        self.log(f"Com métodos async: {self.stats['classes']['with_async_methods']}", 'cyan')
+        self.log(f"Total de classes: {self.stats.classes.total}", 'white')
+        self.log(f"Com docstrings: {self.stats.classes.with_docstrings}", 'cyan')
+        self.log(f"Com type hints: {self.stats.classes.with_type_hints}", 'cyan')
+        self.log(f"Com métodos async: {self.stats.classes.with_async_methods}", 'cyan')
         
-        if self.stats['classes']['total'] > 0:
-            docstring_rate = (self.stats['classes']['with_docstrings'] / self.stats['classes']['total']) * 100
+        if self.stats.classes.total > 0:
+            docstring_rate = (self.stats.classes.with_docstrings / self.stats.classes.total) * 100
             self.log(f"Taxa de documentação: {docstring_rate:.1f}%", 'yellow')
 
     def report_functions(self) -> None:
         """Relatório de funções"""
         self.log_section('🔧 FUNÇÕES')
-        self.log(f"Total de funções: {self.stats['functions']['total']}", 'white')
-        self.log(f"Async: {self.stats['functions']['async']}", 'cyan')
-        self.log(f"Com docstrings: {self.stats['functions']['with_docstrings']}", 'cyan')
-        self.log(f"Com type hints: {self.stats['functions']['with_type_hints']}", 'cyan')
-        self.log(f"Muito longas: {self.stats['functions']['long']}", 'red')
-        
-        if self.stats['functions']['total'] > 0:
-            docstring_rate = (self.stats['functions']['with_docstrings'] / self.stats['functions']['total']) * 100
+        self.log(f"Total de funções: {self.stats.functions.total}", 'white')
+        self.log(f"Async: {self.stats.functions.async_}", 'cyan')
+        self.log(f"Com docstrings: {self.stats.functions.with_docstrings}", 'cyan')
+        self.log(f"Com type hints: {self.stats.functions.with_type_hints}", 'cyan')
+        self.log(f"Muito longas: {self.stats.functions.long}", 'red')
+        
+        if self.stats.functions.total > 0:
+            docstring_rate = (self.stats.functions.with_docstrings / self.stats.functions.total) * 100
             self.log(f"Taxa de documentação: {docstring_rate:.1f}%", 'yellow')
 
     def report_imports(self) -> None:
         """Relatório de imports"""
         self.log_section('📦 IMPORTS')
-        self.log(f"Google: {self.stats['imports']['google']}", 'cyan')
-        self.log(f"Torch: {self.stats['imports']['torch']}", 'cyan')
-        self.log(f"Pandas: {self.stats['imports']['pandas']}", 'cyan')
-        self.log(f"Numpy: {self.stats['imports']['numpy']}", 'cyan')
-        self.log(f"Externos: {self.stats['imports']['external']}", 'cyan')
-        self.log(f"Internos: {self.stats['imports']['internal']}", 'cyan')
+        self.log(f"Google: {self.stats.imports.google}", 'cyan')
+        self.log(f"Torch: {self.stats.imports.torch}", 'cyan')
+        self.log(f"Pandas: {self.stats.imports.pandas}", 'cyan')
+        self.log(f"Numpy: {self.stats.imports.numpy}", 'cyan')
+        self.log(f"Externos: {self.stats.imports.external}", 'cyan')
+        self.log(f"Internos: {self.stats.imports.internal}", 'cyan')
 
     def report_dependencies(self) -> None:
         """Relatório de dependências"""
-        deps = self.analyze_dependencies()
+        deps = self.dependencies
         if not deps:
             return
         
@@ -388,22 +548,20 @@ class CodeAnalyzer:
 
     def report_structure(self) -> None:
         """Relatório de estrutura"""
-        structure = self.analyze_structure()
-        
         self.log_section('🏗️ ESTRUTURA')
-        for path, info in structure.items():
+        for path, info in self.structure.items():
             self.log(f"{path}/: {info['files']} arquivos, {info['directories']} diretórios", 'cyan')
 
     def report_issues(self) -> None:
         """Relatório de problemas"""
-        total_issues = sum(len(issues) for issues in self.stats['issues'].values())
+        total_issues = self.stats.issues.total
         
         self.log_section('⚠️ PROBLEMAS ENCONTRADOS')
         self.log(f"Total: {total_issues}", 'red' if total_issues > 0 else 'green')
         
-        for category, issues in self.stats['issues'].items():
+        for category, issues in self.stats.issues.categories():
             if issues:
-                self.log(f"\n{category.title()} ({len(issues)}):", 'yellow')
+                self.log(f"\n{category.title()} ({self.stats.issues.counts[category]}):", 'yellow')
                 for issue in issues:
                     self.log(f"  {issue.file}: {issue.issue}", 'red')
                     self.log(f"    → {issue.suggestion}", 'cyan')
@@ -415,19 +573,19 @@ class CodeAnalyzer:
         recommendations = []
         
         # Recomendações baseadas nos dados
-        if self.stats['classes']['with_docstrings'] < self.stats['classes']['total'] * 0.5:
+        if self.stats.classes.with_docstrings < self.stats.classes.total * 0.5:
             recommendations.append('Documente mais classes com docstrings')
         
-        if self.stats['functions']['with_docstrings'] < self.stats['functions']['total'] * 0.5:
+        if self.stats.functions.with_docstrings < self.stats.functions.total * 0.5:
             recommendations.append('Documente mais funções com docstrings')
         
-        if self.stats['files']['by_size']['xlarge'] > 0:
+        if self.stats.files.by_size['xlarge'] > 0:
             recommendations.append('Refatore arquivos muito grandes para melhor organização')
         
-        if self.stats['issues']['performance']:
+        if self.stats.issues.performance:
             recommendations.append('Remova prints e otimize código de performance')
         
-        if self.stats['issues']['security']:
+        if self.stats.issues.security:
             recommendations.append('Revise código por questões de segurança')
         
         if recommendations:
@@ -443,16 +601,35 @@ class CodeAnalyzer:
         # Analisar arquivos
         files = self.get_all_files(CONFIG['src_dir'])
         self.log(f"Analisando {len(files)} arquivos em {CONFIG['src_dir']}/...", 'yellow')
-        
-        for file_path in files:
-            self.analyze_file(file_path)
+        self.structure = self.analyze_structure(files)
+        self.flush()
+        
+        if self.incremental:
+            # Mescla na ordem dos arquivos para manter o relatório estável
+            results = self.analyze_incremental(files)
+            for file_path in files:
+                self.merge(results[file_path])
+        else:
+            for result in self.analyze_files(files):
+                self.merge(result)
         
         self.log_success('Análise concluída!')
+        if self.use_cache:
+            self.log(f"Cache de AST: {self.cache_stats['hits']} hits, {self.cache_stats['misses']} misses", 'cyan')
         self.generate_report()
 
 def main():
     """Função principal"""
-    analyzer = CodeAnalyzer()
+    parser = argparse.ArgumentParser(description="Análise de Código VEO")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignora o cache de AST em source-ast-cache/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reanalisa apenas arquivos alterados desde a última execução")
+    parser.add_argument("--full", action="store_true",
+                        help="Com --incremental, descarta o índice e reconstrói tudo")
+    args = parser.parse_args()
+    
+    analyzer = CodeAnalyzer(use_cache=not args.no_cache, incremental=args.incremental, full=args.full)
     analyzer.run()
 
 if __name__ == '__main__':
@@ -4,10 +4,14 @@ Gerenciador de Prompts VEO
 Facilita a criação, organização e uso de prompts.
 """
 
+import asyncio
+import atexit
+import mmap
 import os
+import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple
 import argparse
 import json
 
@@ -15,10 +19,30 @@ import json
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from veo.models.config import VEOConfig
-from veo.core.generator import VideoGenerator
+from veo.utils.event_loop import fast_loop_factory
 from veo.utils.logger import setup_logger, get_logger
 
+if TYPE_CHECKING:
+    from veo.models.config import VEOConfig
+
+# Prompt files below this size are read directly instead of memory-mapped
+MMAP_MIN_SIZE = 4096
+
+# First markdown header mentioning "prompt"/"cena", followed by its body up to
+# the next header that mentions neither (matching headers are merged in)
+_PROMPT_SECTION_RE = re.compile(
+    r'^#.*(?:prompt|cena).*$\n?'
+    r'((?:^(?!#).*$\n?|^#.*(?:prompt|cena).*$\n?)*)',
+    re.IGNORECASE | re.MULTILINE
+)
+_HEADER_RE = re.compile(r'^#.*$', re.MULTILINE)
+_WS_RE = re.compile(r'\s+')
+
+
+def _strip_headers(text: str) -> str:
+    """Remove markdown headers and collapse whitespace into single spaces."""
+    return _WS_RE.sub(' ', _HEADER_RE.sub(' ', text)).strip()
+
 
 class PromptManager:
     """Gerenciador de prompts para VEO."""
@@ -27,25 +51,114 @@ class PromptManager:
         self.prompts_dir = project_root / "prompts"
         self.logger = get_logger("prompt_manager")
         setup_logger()
+        
+        # Created on first use and reused by every generate/batch call
+        self._config: Optional["VEOConfig"] = None
+        self._generator = None
+        self._runner: Optional[asyncio.Runner] = None
+        # category -> (max subdir mtime_ns, sorted prompt paths)
+        self._list_cache: Dict[str, Tuple[int, List[Path]]] = {}
+        # (category mtimes, basename -> prompt path) used by resolve_prompt
+        self._name_index: Optional[Tuple[Tuple[int, ...], Dict[str, Path]]] = None
+    
+    def _get_generator(self):
+        """Retorna o VideoGenerator compartilhado, criando-o na primeira chamada."""
+        if self._generator is None:
+            # Heavy imports (pydantic, torch, diffusers, google-cloud); only needed
+            # to generate, so list/show/create never pay for them
+            from veo.core.generator import VideoGenerator
+            from veo.models.config import VEOConfig
+            
+            self._config = VEOConfig.from_env()
+            self._generator = VideoGenerator(self._config)
+        return self._generator
+    
+    def _run(self, coro):
+        """Executa uma corrotina no event loop de longa duração do gerenciador."""
+        if self._runner is None:
+            # Usa o uvloop, se instalado, apenas neste loop
+            self._runner = asyncio.Runner(loop_factory=fast_loop_factory())
+            atexit.register(self.close)
+        return self._runner.run(coro)
+    
+    def close(self) -> None:
+        """Libera o cliente HTTP do gerador e encerra o event loop compartilhado."""
+        if self._runner is None:
+            return
+        if self._generator is not None:
+            self._runner.run(self._generator.aclose())
+        self._runner.close()
+        self._runner = None
     
     def list_prompts(self, category: str = "all") -> List[Path]:
         """Lista todos os prompts disponíveis."""
-        prompts = []
+        subdirs = ["templates", "projects", "examples"] if category == "all" else [category]
+        
+        # Invalidate the cached listing whenever any of the directories changes
+        mtimes = []
+        for subdir in subdirs:
+            try:
+                mtimes.append(os.stat(self.prompts_dir / subdir).st_mtime_ns)
+            except OSError:
+                mtimes.append(-1)
+        mtime = max(mtimes)
         
-        if category == "all":
-            for subdir in ["templates", "projects", "examples"]:
-                prompts.extend(self.prompts_dir.glob(f"{subdir}/*.txt"))
-        else:
-            prompts.extend(self.prompts_dir.glob(f"{category}/*.txt"))
+        cached = self._list_cache.get(category)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
         
-        return sorted(prompts)
+        # Sort plain (subdir, name) tuples and build Path objects only at the end
+        names = []
+        for subdir in subdirs:
+            try:
+                with os.scandir(self.prompts_dir / subdir) as entries:
+                    names.extend(
+                        (subdir, entry.name) for entry in entries
+                        if entry.name.endswith('.txt') and entry.is_file()
+                    )
+            except OSError:
+                continue
+        names.sort()
+        
+        prompts = [self.prompts_dir / subdir / name for subdir, name in names]
+        self._list_cache[category] = (mtime, prompts)
+        return list(prompts)
+    
+    def resolve_prompt(self, name: str) -> Optional[Path]:
+        """Localiza um prompt pelo nome de arquivo nas categorias (projects, templates, examples)."""
+        categories = ("projects", "templates", "examples")
+        for category in categories:
+            self.list_prompts(category)
+        
+        # Rebuild the basename table only when one of the category listings changed
+        key = tuple(self._list_cache[category][0] for category in categories)
+        if self._name_index is None or self._name_index[0] != key:
+            index: Dict[str, Path] = {}
+            for category in categories:
+                for path in self._list_cache[category][1]:
+                    index.setdefault(path.name, path)
+            self._name_index = (key, index)
+        
+        return self._name_index[1].get(name)
     
     def show_prompt(self, prompt_file: Path) -> str:
         """Mostra o conteúdo de um prompt."""
         try:
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return content
+            fd = os.open(prompt_file, os.O_RDONLY)
+            try:
+                size = os.fstat(fd).st_size
+                if size == 0:
+                    return ""
+                if size < MMAP_MIN_SIZE:
+                    # Small files: a plain read is cheaper than setting up a mapping
+                    return os.read(fd, size).decode('utf-8')
+                
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    return mm[:].decode('utf-8')
+            finally:
+                os.close(fd)
         except Exception as e:
             self.logger.error(f"Erro ao ler prompt: {e}")
             return ""
@@ -57,8 +170,8 @@ class PromptManager:
         
         prompt_file = category_dir / f"{name}.txt"
         
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Encode once and write raw bytes, skipping the TextIOWrapper layer
+        prompt_file.write_bytes(content.encode('utf-8'))
         
         self.logger.info(f"Prompt criado: {prompt_file}")
         return prompt_file
@@ -66,32 +179,20 @@ class PromptManager:
     def generate_from_prompt(self, prompt_file: Path, **kwargs) -> List[Path]:
         """Gera vídeo a partir de um prompt."""
         try:
-            # Load configuration
-            config = VEOConfig.from_env()
-            generator = VideoGenerator(config)
+            generator = self._get_generator()
             
             # Read prompt content
             prompt_content = self.show_prompt(prompt_file)
             
             # Extract prompt from content (remove markdown headers)
-            lines = prompt_content.split('\n')
-            prompt_lines = []
-            in_prompt = False
-            
-            for line in lines:
-                if line.startswith('#') and ('prompt' in line.lower() or 'cena' in line.lower()):
-                    in_prompt = True
-                    continue
-                elif line.startswith('#') and in_prompt:
-                    break
-                elif in_prompt and line.strip():
-                    prompt_lines.append(line.strip())
+            prompt_text = ""
+            match = _PROMPT_SECTION_RE.search(prompt_content)
+            if match:
+                prompt_text = _strip_headers(match.group(1))
             
-            if not prompt_lines:
+            if not prompt_text:
                 # If no structured prompt found, use the whole content
-                prompt_lines = [line.strip() for line in lines if line.strip() and not line.startswith('#')]
-            
-            prompt_text = ' '.join(prompt_lines)
+                prompt_text = _strip_headers(prompt_content)
             
             if not prompt_text:
                 raise ValueError("Nenhum prompt encontrado no arquivo")
@@ -99,8 +200,7 @@ class PromptManager:
             self.logger.info(f"Gerando vídeo com prompt: {prompt_text[:100]}...")
             
             # Generate video
-            import asyncio
-            video_paths = asyncio.run(generator.generate_from_prompt(
+            video_paths = self._run(generator.generate_from_prompt(
                 prompt=prompt_text,
                 **kwargs
             ))
@@ -111,21 +211,27 @@ class PromptManager:
             self.logger.error(f"Erro ao gerar vídeo: {e}")
             raise
     
-    def batch_generate(self, prompt_files: List[Path], **kwargs) -> List[List[Path]]:
-        """Gera vídeos em lote a partir de múltiplos prompts."""
+    def batch_generate(
+        self,
+        prompt_files: List[Path],
+        on_result: Optional[Callable[[int, List[Path]], None]] = None,
+        **kwargs
+    ) -> List[List[Path]]:
+        """
+        Gera vídeos em lote a partir de múltiplos prompts.
+        
+        Os lotes são processados concorrentemente em um único event loop;
+        on_result(índice, vídeos) é chamado assim que cada lote termina.
+        """
         try:
-            # Load configuration
-            config = VEOConfig.from_env()
-            generator = VideoGenerator(config)
+            generator = self._get_generator()
             
             # Read all prompts
             prompts = []
             for prompt_file in prompt_files:
                 content = self.show_prompt(prompt_file)
                 # Extract prompt text (simplified)
-                lines = [line.strip() for line in content.split('\n') 
-                        if line.strip() and not line.startswith('#')]
-                prompt_text = ' '.join(lines)
+                prompt_text = _strip_headers(content)
                 if prompt_text:
                     prompts.append(prompt_text)
             
@@ -134,14 +240,28 @@ class PromptManager:
             
             self.logger.info(f"Gerando {len(prompts)} vídeos em lote...")
             
-            # Generate videos
-            import asyncio
-            all_video_paths = asyncio.run(generator.batch_generate_from_prompts(
-                prompts=prompts,
-                **kwargs
-            ))
+            # Generate videos, streaming each lot as soon as it finishes
+            async def run_batch() -> List[List[Path]]:
+                semaphore = asyncio.Semaphore(self._config.max_concurrent_operations)
+                
+                async def generate_one(index: int, prompt: str):
+                    async with semaphore:
+                        try:
+                            return index, await generator.generate_from_prompt(prompt=prompt, **kwargs)
+                        except Exception as e:
+                            self.logger.error(f"Erro no lote {index + 1}: {e}")
+                            return index, []
+                
+                results: List[List[Path]] = [[] for _ in prompts]
+                tasks = [generate_one(i, prompt) for i, prompt in enumerate(prompts)]
+                for next_done in asyncio.as_completed(tasks):
+                    index, video_paths = await next_done
+                    results[index] = video_paths
+                    if on_result:
+                        on_result(index, video_paths)
+                return results
             
-            return all_video_paths
+            return self._run(run_batch())
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar vídeos em lote: {e}")
@@ -234,20 +354,28 @@ def main():
                 if prompt_file.parts[0] == "prompts":
                     prompt_file = project_root / prompt_file
                 else:
-                    # Try different possible paths
-                    possible_paths = [
-                        project_root / "prompts" / prompt_file,
-                        project_root / "prompts" / "projects" / prompt_file,
-                        project_root / "prompts" / "templates" / prompt_file,
-                        project_root / "prompts" / "examples" / prompt_file
-                    ]
+                    # prompts/<nome> tem prioridade; nomes simples são então
+                    # procurados nas listagens de categoria em cache
+                    direct_path = project_root / "prompts" / prompt_file
+                    resolved = direct_path if direct_path.exists() else None
+                    if resolved is None and len(prompt_file.parts) == 1:
+                        resolved = manager.resolve_prompt(prompt_file.name)
+                    
+                    if resolved is None:
+                        # Try different possible paths
+                        possible_paths = [
+                            project_root / "prompts" / "projects" / prompt_file,
+                            project_root / "prompts" / "templates" / prompt_file,
+                            project_root / "prompts" / "examples" / prompt_file
+                        ]
+                        
+                        # Find the first existing path
+                        for path in possible_paths:
+                            if path.exists():
+                                resolved = path
+                                break
                     
-                    # Find the first existing path
-                    prompt_file = None
-                    for path in possible_paths:
-                        if path.exists():
-                            prompt_file = path
-                            break
+                    prompt_file = resolved
                     
                     if prompt_file is None:
                         raise FileNotFoundError(f"Prompt file not found: {args.prompt_file}")
@@ -269,16 +397,16 @@ def main():
                 print(f"❌ Nenhum prompt encontrado em {args.category}")
                 return
             
+            print(f"\n🎬 Gerando {len(prompts)} lote(s) de vídeos:")
             all_video_paths = manager.batch_generate(
                 prompts,
+                on_result=lambda i, video_paths: print(f"  Lote {i+1}: {len(video_paths)} vídeo(s)"),
                 aspect_ratio=args.aspect,
                 duration=args.duration,
                 number_of_videos=args.count
             )
             
-            print(f"\n✅ {len(all_video_paths)} lote(s) de vídeos gerados:")
-            for i, video_paths in enumerate(all_video_paths):
-                print(f"  Lote {i+1}: {len(video_paths)} vídeo(s)")
+            print(f"\n✅ {len(all_video_paths)} lote(s) de vídeos gerados")
     
     except Exception as e:
         print(f"❌ Erro: {e}")
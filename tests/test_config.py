@@ -0,0 +1,41 @@
+"""
+Tests for VideoRequest.validate_batch.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from veo.models.config import AspectRatio, PersonGeneration, VideoRequest
+
+PROMPT_A = "A calm landscape at golden hour"
+PROMPT_B = "A busy city street at night, neon lights"
+
+
+def test_validate_batch_matches_individual_construction():
+    data = [
+        {"prompt": PROMPT_A},
+        {"prompt": PROMPT_B, "aspect_ratio": "9:16", "duration": 4, "number_of_videos": 2},
+    ]
+
+    requests = VideoRequest.validate_batch(data)
+
+    assert requests == [VideoRequest(**item) for item in data]
+    assert [request.prompt for request in requests] == [PROMPT_A, PROMPT_B]
+    assert requests[1].aspect_ratio is AspectRatio.PORTRAIT
+    assert requests[0].person_generation is PersonGeneration.ALLOW_ADULT
+
+
+def test_validate_batch_accepts_enum_members():
+    (request,) = VideoRequest.validate_batch([{"prompt": PROMPT_A, "aspect_ratio": AspectRatio.SQUARE}])
+    assert request.aspect_ratio is AspectRatio.SQUARE
+
+
+def test_validate_batch_reports_the_failing_item():
+    with pytest.raises(ValidationError) as excinfo:
+        VideoRequest.validate_batch([{"prompt": PROMPT_A}, {"prompt": "short"}])
+
+    assert excinfo.value.errors()[0]["loc"][:2] == (1, "prompt")
+
+
+def test_validate_batch_empty():
+    assert VideoRequest.validate_batch([]) == []
@@ -0,0 +1,58 @@
+"""
+Tests for prompt coalescing in VideoGenerator.batch_generate_from_prompts.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from veo.core.generator import VideoGenerator
+from veo.models.config import VEOConfig
+
+PROMPT_A = "A calm landscape at golden hour"
+PROMPT_B = "A busy city street at night, neon lights"
+
+
+@pytest.fixture
+def generator(tmp_path):
+    """Generator whose video API and downloads are replaced by async mocks."""
+    generator = VideoGenerator(VEOConfig(output_dir=tmp_path))
+
+    async def generate(request, progress_callback=None):
+        return [f"file://{request.prompt}.mp4"]
+
+    async def download(uri, request, index, total, stem):
+        return tmp_path / f"{stem}_{index}.mp4"
+
+    generator.client.api_client.generate_video_async = AsyncMock(side_effect=generate)
+    generator._download_video = AsyncMock(side_effect=download)
+    return generator
+
+
+def _generated_prompts(generator):
+    return [call.args[0].prompt for call in generator.client.api_client.generate_video_async.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_prompts_generate_once(generator):
+    progress = []
+    results = await generator.batch_generate_from_prompts(
+        [PROMPT_A, PROMPT_B, PROMPT_A],
+        progress_callback=progress.append
+    )
+
+    assert sorted(_generated_prompts(generator)) == sorted([PROMPT_A, PROMPT_B])
+    assert results[0] == results[2]
+    assert results[0] != results[1]
+    assert all(len(paths) == 1 for paths in results)
+    assert sorted(progress) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_results_are_not_reused_across_batches(generator):
+    first = await generator.batch_generate_from_prompts([PROMPT_A])
+    second = await generator.batch_generate_from_prompts([PROMPT_A])
+
+    assert _generated_prompts(generator) == [PROMPT_A, PROMPT_A]
+    assert first != second
+
@@ -0,0 +1,79 @@
+"""
+Tests for the SVD circuit breaker in VideoGeneratorAPI.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from veo.core import video_generator_api
+from veo.core.video_generator_api import (
+    SVD_COOLDOWN_SECONDS, SVD_FAILURE_THRESHOLD, VideoGeneratorAPI
+)
+from veo.models.config import VEOConfig, VideoRequest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.monotonic() seen by video_generator_api (the event loop keeps the real one)."""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(video_generator_api, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+@pytest.fixture
+def api(tmp_path):
+    """API with both video clients replaced by async mocks."""
+    api = VideoGeneratorAPI(VEOConfig(output_dir=tmp_path))
+    api.svd_client = SimpleNamespace(generate_video_async=AsyncMock(return_value=["file://svd.mp4"]))
+    api.ltx_client = SimpleNamespace(generate_video_async=AsyncMock(return_value=["file://ltx.mp4"]))
+    return api
+
+
+@pytest.fixture
+def request_():
+    return VideoRequest(prompt="A calm landscape at golden hour")
+
+
+async def _fail_svd(api, request_, times):
+    api.svd_client.generate_video_async.side_effect = RuntimeError("SVD unavailable")
+    for _ in range(times):
+        assert await api.generate_video_async(request_) == ["file://ltx.mp4"]
+    api.svd_client.generate_video_async.side_effect = None
+
+
+@pytest.mark.asyncio
+async def test_svd_is_primary(api, clock, request_):
+    assert await api.generate_video_async(request_) == ["file://svd.mp4"]
+    api.ltx_client.generate_video_async.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_repeated_svd_failures_skip_svd_during_cooldown(api, clock, request_):
+    await _fail_svd(api, request_, SVD_FAILURE_THRESHOLD)
+    assert api.svd_client.generate_video_async.await_count == SVD_FAILURE_THRESHOLD
+
+    clock.now += SVD_COOLDOWN_SECONDS - 1
+    assert await api.generate_video_async(request_) == ["file://ltx.mp4"]
+    assert api.svd_client.generate_video_async.await_count == SVD_FAILURE_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_svd_is_retried_after_cooldown(api, clock, request_):
+    await _fail_svd(api, request_, SVD_FAILURE_THRESHOLD)
+
+    clock.now += SVD_COOLDOWN_SECONDS + 1
+    assert await api.generate_video_async(request_) == ["file://svd.mp4"]
+    assert api._svd_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_svd_success_resets_failure_count(api, clock, request_):
+    await _fail_svd(api, request_, SVD_FAILURE_THRESHOLD - 1)
+    assert await api.generate_video_async(request_) == ["file://svd.mp4"]
+    await _fail_svd(api, request_, SVD_FAILURE_THRESHOLD - 1)
+
+    # Never SVD_FAILURE_THRESHOLD failures in a row: SVD is still tried first
+    assert await api.generate_video_async(request_) == ["file://svd.mp4"]
+    assert api.svd_client.generate_video_async.await_count == 2 * SVD_FAILURE_THRESHOLD
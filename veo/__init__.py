@@ -6,11 +6,6 @@ A modern, async-first video generation system using Google's VEO API.
 __version__ = "2.0.0"
 __author__ = "Mellø"
 
-from .core.client import VEOClient
-from .core.generator import VideoGenerator
-from .models.config import VEOConfig, VideoRequest
-from .utils.logger import setup_logger
-
 __all__ = [
     "VEOClient",
     "VideoGenerator", 
@@ -18,3 +13,28 @@ __all__ = [
     "VideoRequest",
     "setup_logger"
 ]
+
+# Public names are resolved on first access (PEP 562) so that importing the
+# package, or a single submodule, does not load the whole generation stack.
+_LAZY_IMPORTS = {
+    "VEOClient": ".core.client",
+    "VideoGenerator": ".core.generator",
+    "VEOConfig": ".models.config",
+    "VideoRequest": ".models.config",
+    "setup_logger": ".utils.logger",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,6 +3,8 @@ VEO CLI - Modern command-line interface for video generation.
 """
 
 import asyncio
+import functools
+import os
 import sys
 from pathlib import Path
 from typing import Optional, List
@@ -12,8 +14,9 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeEl
 from rich.panel import Panel
 from rich.table import Table
 
-from ..models.config import VEOConfig, AspectRatio, PersonGeneration
+from ..models.config import VEOConfig, AspectRatio, PersonGeneration, PROMPT_MIN_LENGTH, PROMPT_MAX_LENGTH
 from ..core.generator import VideoGenerator
+from ..utils.event_loop import fast_loop_factory
 from ..utils.logger import setup_logger, get_logger
 
 # Initialize CLI
@@ -24,6 +27,31 @@ app = typer.Typer(
 )
 console = Console()
 
+BYTES_PER_MB = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> VEOConfig:
+    """Load configuration from the environment once per process."""
+    return VEOConfig.from_env()
+
+
+def _run(generator: VideoGenerator, coro):
+    """
+    Run a command's coroutine on a new event loop (uvloop when installed).
+    
+    The generator's pooled HTTP clients are closed on the same loop before it
+    shuts down, whether or not the command succeeded.
+    """
+    async def run_and_close():
+        try:
+            return await coro
+        finally:
+            await generator.aclose()
+    
+    with asyncio.Runner(loop_factory=fast_loop_factory()) as runner:
+        return runner.run(run_and_close())
+
 
 def create_progress_callback(progress: Progress, task_id):
     """Create progress callback for video generation."""
@@ -56,11 +84,8 @@ def generate(
     
     try:
         # Load configuration
-        if config_file and config_file.exists():
-            # TODO: Implement config file loading
-            config = VEOConfig.from_env()
-        else:
-            config = VEOConfig.from_env()
+        # TODO: Implement config file loading (config_file is currently ignored)
+        config = _load_config()
         
         # Validate Hugging Face token
         if not config.huggingface_token:
@@ -100,7 +125,7 @@ def generate(
             
             if image:
                 # Generate from image
-                video_paths = asyncio.run(generator.generate_from_image(
+                video_paths = _run(generator, generator.generate_from_image(
                     prompt=prompt,
                     image_path=image,
                     aspect_ratio=aspect_ratio,
@@ -112,7 +137,7 @@ def generate(
                 ))
             else:
                 # Generate from prompt only
-                video_paths = asyncio.run(generator.generate_from_prompt(
+                video_paths = _run(generator, generator.generate_from_prompt(
                     prompt=prompt,
                     aspect_ratio=aspect_ratio,
                     duration=duration,
@@ -132,12 +157,12 @@ def generate(
         results_table.add_column("File Path", style="green")
         results_table.add_column("Size", style="yellow")
         
-        for i, video_path in enumerate(video_paths):
-            size = video_path.stat().st_size / (1024 * 1024)  # MB
+        for i, video_path in enumerate(video_paths, 1):
+            # One stat per row; the MB conversion happens inside the format spec
             results_table.add_row(
-                str(i + 1),
-                str(video_path),
-                f"{size:.1f} MB"
+                str(i),
+                os.fspath(video_path),
+                f"{os.stat(video_path).st_size / BYTES_PER_MB:.1f} MB"
             )
         
         console.print(results_table)
@@ -169,7 +194,7 @@ def batch(
     
     try:
         # Load configuration
-        config = VEOConfig.from_env()
+        config = _load_config()
         
         # Validate Hugging Face token
         if not config.huggingface_token:
@@ -181,8 +206,20 @@ def batch(
             console.print(f"[red]❌ Error: Prompts file not found: {prompts_file}[/red]")
             raise typer.Exit(1)
         
-        with open(prompts_file, 'r', encoding='utf-8') as f:
-            prompts = [line.strip() for line in f if line.strip()]
+        # Stream the file once, validating prompt lengths before any model is loaded
+        prompts = []
+        with open(prompts_file, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            for line_number, line in enumerate(f, 1):
+                prompt = line.strip()
+                if not prompt:
+                    continue
+                if not PROMPT_MIN_LENGTH <= len(prompt) <= PROMPT_MAX_LENGTH:
+                    console.print(
+                        f"[red]❌ Error: Prompt on line {line_number} must be between "
+                        f"{PROMPT_MIN_LENGTH} and {PROMPT_MAX_LENGTH} characters[/red]"
+                    )
+                    raise typer.Exit(1)
+                prompts.append(prompt)
         
         if not prompts:
             console.print("[red]❌ Error: No prompts found in file[/red]")
@@ -204,14 +241,15 @@ def batch(
             
             task = progress.add_task(f"Generating {len(prompts)} batches...", total=len(prompts))
             
-            all_video_paths = asyncio.run(generator.batch_generate_from_prompts(
+            all_video_paths = _run(generator, generator.batch_generate_from_prompts(
                 prompts=prompts,
                 aspect_ratio=aspect_ratio,
                 duration=duration,
                 number_of_videos=count,
                 person_generation=person_generation,
                 enhance_prompt=enhance,
-                max_concurrent=max_concurrent
+                max_concurrent=max_concurrent,
+                progress_callback=lambda _: progress.update(task, advance=1)
             ))
             
             progress.update(task, completed=len(prompts))
@@ -251,7 +289,7 @@ def cleanup(
     
     try:
         # Load configuration
-        config = VEOConfig.from_env()
+        config = _load_config()
         
         # Initialize generator
         generator = VideoGenerator(config)
@@ -273,7 +311,7 @@ def config():
     """Show current configuration."""
     
     try:
-        config = VEOConfig.from_env()
+        config = _load_config()
         
         config_table = Table(title="⚙️ VEO Configuration")
         config_table.add_column("Setting", style="cyan")
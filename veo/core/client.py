@@ -4,19 +4,39 @@ VEO API client with async support and retry logic.
 
 import asyncio
 import time
-from typing import List, Optional, Dict, Any
+from typing import Any, Awaitable, Callable, List, Optional, Dict
 from pathlib import Path
 
+from asyncio_throttle import Throttler
+
 from ..models.config import VEOConfig, VideoRequest
+from ..utils.event_loop import fast_loop_factory
 from ..utils.logger import get_logger
 from .video_generator_api import VideoGeneratorAPI
 
 
+def _is_fatal(error: Exception) -> bool:
+    """
+    Check whether an error should abort a whole batch.
+    
+    Args:
+        error: Exception raised by a single generation request
+        
+    Returns:
+        True for authentication/permission failures (HTTP 401/403)
+    """
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) in (401, 403)
+
+
 class VEOClient:
     """
     Modern VEO API client with async support, retry logic, and proper error handling.
     """
     
+    # Requests-per-minute limiters by rate, shared by every client of the process
+    _limiters: Dict[int, Throttler] = {}
+    
     def __init__(self, config: VEOConfig):
         """
         Initialize VEO client.
@@ -30,6 +50,16 @@ class VEOClient:
         # Initialize video generation API
         self.api_client = VideoGeneratorAPI(config)
         
+        # Process-wide requests-per-minute cap, applied to every generation
+        # (single, sync and batch); concurrency is capped separately
+        rate = config.requests_per_minute
+        if rate not in self._limiters:
+            self._limiters[rate] = Throttler(rate_limit=rate, period=60)
+        self._limiter = self._limiters[rate]
+        
+        # Event loop for generate_video_sync, created on first use
+        self._runner: Optional[asyncio.Runner] = None
+        
         self.logger.info(f"VEO client initialized with model: {config.model}")
     
     async def generate_video_async(
@@ -51,7 +81,8 @@ class VEOClient:
         
         try:
             # Use real VEO API
-            video_uris = await self.api_client.generate_video_async(request, progress_callback)
+            async with self._limiter:
+                video_uris = await self.api_client.generate_video_async(request, progress_callback)
             
             self.logger.success(f"Generated {len(video_uris)} video(s) successfully")
             return video_uris
@@ -87,22 +118,41 @@ class VEOClient:
         Returns:
             List of generated video URIs
         """
-        return asyncio.run(self.generate_video_async(request, progress_callback))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "generate_video_sync cannot be called from a running event loop; "
+                "await generate_video_async instead"
+            )
+        
+        # Reuse one event loop across sync calls instead of creating one per call
+        if self._runner is None:
+            self._runner = asyncio.Runner(loop_factory=fast_loop_factory())
+        return self._runner.run(self.generate_video_async(request, progress_callback))
     
     async def batch_generate_videos(
         self, 
         requests: List[VideoRequest],
-        max_concurrent: Optional[int] = None
-    ) -> List[List[str]]:
+        max_concurrent: Optional[int] = None,
+        progress_callback: Optional[callable] = None,
+        on_complete: Optional[Callable[[int, List[str]], Awaitable[Any]]] = None
+    ) -> List[Any]:
         """
         Generate multiple videos concurrently.
         
         Args:
             requests: List of video generation requests
             max_concurrent: Maximum concurrent operations
+            progress_callback: Optional callback called with each request index as it completes
+            on_complete: Optional coroutine run on (index, video URIs) right after each
+                request is generated, outside the concurrency limit; its return value
+                replaces the URI list in the results
             
         Returns:
-            List of video URI lists for each request
+            List of video URI lists (or on_complete results) for each request
         """
         max_concurrent = max_concurrent or self.config.max_concurrent_operations
         
@@ -110,21 +160,38 @@ class VEOClient:
         
         semaphore = asyncio.Semaphore(max_concurrent)
         
-        async def generate_with_semaphore(request):
-            async with semaphore:
-                return await self.generate_video_async(request)
+        # Handle each result as soon as it completes instead of after the whole batch
+        successful_results: List[Any] = [[] for _ in requests]
         
-        tasks = [generate_with_semaphore(req) for req in requests]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Handle exceptions
-        successful_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.error(f"Request {i} failed: {str(result)}")
-                successful_results.append([])
+        async def generate_with_semaphore(index, request):
+            try:
+                async with semaphore:
+                    result = await self.generate_video_async(request)
+            except Exception as e:
+                # Auth/permission failures will fail every sibling too: abort the batch
+                if _is_fatal(e):
+                    raise
+                self.logger.error(f"Request {index} failed: {str(e)}")
             else:
-                successful_results.append(result)
+                # Post-processing overlaps with the next request's generation; its
+                # failures (e.g. one expired download URL) only affect this request
+                try:
+                    if on_complete:
+                        result = await on_complete(index, result)
+                    successful_results[index] = result
+                except Exception as e:
+                    self.logger.error(f"Request {index} post-processing failed: {str(e)}")
+            if progress_callback:
+                progress_callback(index)
+        
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for i, req in enumerate(requests):
+                    tg.create_task(generate_with_semaphore(i, req))
+        except* Exception as eg:
+            # TaskGroup already cancelled the remaining requests; surface the cause
+            self.logger.error(f"Batch generation aborted: {eg.exceptions[0]}")
+            raise eg.exceptions[0]
         
         self.logger.success(f"Batch generation completed: {len(successful_results)} results")
         return successful_results
\ No newline at end of file
@@ -3,18 +3,30 @@ High-level video generation interface with file management and utilities.
 """
 
 import asyncio
+import importlib.util
+import os
 import time
+import uuid
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 import aiofiles
-from google.cloud import storage
+import aiofiles.os
 
 from ..models.config import VEOConfig, VideoRequest, AspectRatio, PersonGeneration
 from ..core.client import VEOClient
 from ..utils.logger import get_logger
 
 
+# Read/write granularity for HTTP video downloads (1 MiB)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# GCS blobs above this size are downloaded as parallel byte ranges
+GCS_PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+GCS_CHUNK_SIZE = 32 * 1024 * 1024
+GCS_MAX_WORKERS = 8
+
+
 class VideoGenerator:
     """
     High-level video generation interface with file management and utilities.
@@ -35,11 +47,54 @@ class VideoGenerator:
         self.gcs_client = None
         if config.gcs_bucket:
             try:
+                # Imported only when a bucket is configured (pulls in the gRPC/protobuf stack)
+                from google.cloud import storage
+                
                 self.gcs_client = storage.Client()
                 self.logger.info(f"GCS client initialized for bucket: {config.gcs_bucket}")
             except Exception as e:
                 self.logger.warning(f"Failed to initialize GCS client: {e}")
                 self.gcs_client = None
+        
+        # Shared HTTP client for direct-URL downloads, created on first use
+        self._http_client = None
+        
+        # URI scheme -> downloader; local files (and GCS without a client) go through the API client
+        self._downloaders = {
+            "file": self.client.api_client.download_video,
+            "gs": self._download_from_gcs if self.gcs_client else self.client.api_client.download_video,
+        }
+    
+    def _get_http_client(self):
+        """
+        Get the pooled HTTP client, creating it on first use.
+        
+        Returns:
+            Shared httpx.AsyncClient with keep-alive connection pooling (and
+            HTTP/2 multiplexing when the h2 package is installed)
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            import httpx
+            
+            max_concurrent = self.config.max_concurrent_operations
+            self._http_client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(
+                    max_connections=max_concurrent * 4,
+                    max_keepalive_connections=max_concurrent * 2
+                )
+            )
+        return self._http_client
+    
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP clients. Must run on the loop that used them.
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        await self.client.api_client.aclose()
     
     async def generate_from_prompt(
         self,
@@ -118,6 +173,16 @@ class VideoGenerator:
         
         return await self._generate_and_download(request)
     
+    @staticmethod
+    def _default_stem() -> str:
+        """
+        Build the default filename stem for one request's videos.
+        
+        Returns:
+            Timestamp plus a short random suffix, unique across same-second requests
+        """
+        return f"video_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    
     async def _generate_and_download(self, request: VideoRequest) -> List[Path]:
         """
         Generate video and download to local storage.
@@ -133,17 +198,21 @@ class VideoGenerator:
         # Set up GCS output if configured
         if self.config.gcs_bucket and not request.output_gcs_uri:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            request.output_gcs_uri = f"gs://{self.config.gcs_bucket}/videos/{timestamp}/"
+            request = request.model_copy(
+                update={"output_gcs_uri": f"gs://{self.config.gcs_bucket}/videos/{timestamp}/"}
+            )
         
         # Generate video
         video_uris = await self.client.generate_video_async(request)
         
-        # Download videos
-        local_paths = []
-        for i, uri in enumerate(video_uris):
-            local_path = await self._download_video(uri, request, i)
-            local_paths.append(local_path)
-        
+        # Download videos concurrently (wall time bounded by the slowest one)
+        await aiofiles.os.makedirs(self.config.output_dir, exist_ok=True)
+        stem = self._default_stem()
+        local_paths = list(await asyncio.gather(*(
+            self._download_video(uri, request, i, len(video_uris), stem)
+            for i, uri in enumerate(video_uris)
+        )))
+
         self.logger.success(f"Generated and downloaded {len(local_paths)} video(s)")
         return local_paths
     
@@ -151,7 +220,9 @@ class VideoGenerator:
         self, 
         video_uri: str, 
         request: VideoRequest, 
-        index: int
+        index: int,
+        total: int = 1,
+        stem: Optional[str] = None
     ) -> Path:
         """
         Download video from URI to local storage.
@@ -160,34 +231,31 @@ class VideoGenerator:
             video_uri: Video URI (GCS or direct)
             request: Original video request
             index: Video index for naming
+            total: Number of videos produced by the request
+            stem: Default filename stem shared by the request's videos
             
         Returns:
             Local file path
         """
         # Generate filename
         if request.output_filename:
-            if len(video_uris) > 1:
+            if total > 1:
                 name = f"{request.output_filename}_{index}.mp4"
             else:
                 name = f"{request.output_filename}.mp4"
         else:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            name = f"video_{timestamp}_{index}.mp4"
+            name = f"{stem or self._default_stem()}_{index}.mp4"
         
         local_path = self.config.output_dir / name
         
-        # Download based on URI type
-        if video_uri.startswith("file://"):
-            # Local file - use API client
-            await self.client.api_client.download_video(video_uri, local_path)
-        elif video_uri.startswith("gs://"):
-            if self.gcs_client:
-                await self._download_from_gcs(video_uri, local_path)
-            else:
-                # Use the API client to download
-                await self.client.api_client.download_video(video_uri, local_path)
-        else:
-            await self._download_from_url(video_uri, local_path)
+        # output_dir itself is created once per request; output_filename may add subdirectories
+        if local_path.parent != self.config.output_dir:
+            await aiofiles.os.makedirs(local_path.parent, exist_ok=True)
+        
+        # Download based on URI scheme (anything unknown is fetched over HTTP)
+        scheme = video_uri.partition("://")[0]
+        downloader = self._downloaders.get(scheme, self._download_from_url)
+        await downloader(video_uri, local_path)
         
         self.logger.info(f"Downloaded video: {local_path}")
         return local_path
@@ -195,6 +263,7 @@ class VideoGenerator:
     async def _download_from_gcs(self, gcs_uri: str, local_path: Path) -> None:
         """
         Download video from Google Cloud Storage.
+        The destination directory is created once per request by the caller.
         
         Args:
             gcs_uri: GCS URI (gs://bucket/path)
@@ -209,37 +278,51 @@ class VideoGenerator:
         
         bucket_name, blob_name = gcs_uri[5:].split("/", 1)
         
-        # Download
+        # Download (get_blob fetches the size; a missing blob still fails on download)
         bucket = self.gcs_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
+        blob = await asyncio.to_thread(bucket.get_blob, blob_name) or bucket.blob(blob_name)
         
-        # Ensure directory exists
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Download file
-        blob.download_to_filename(str(local_path))
+        # Download file in a worker thread; the storage client is synchronous
+        if blob.size and blob.size > GCS_PARALLEL_MIN_SIZE:
+            # Large videos: fetch byte ranges in parallel instead of one stream
+            from google.cloud.storage import transfer_manager
+            
+            await asyncio.to_thread(
+                transfer_manager.download_chunks_concurrently,
+                blob,
+                str(local_path),
+                chunk_size=GCS_CHUNK_SIZE,
+                # Threads, not processes: chunks are I/O-bound, and forking a
+                # multi-threaded (possibly CUDA-initialized) process can deadlock
+                worker_type=transfer_manager.THREAD,
+                max_workers=GCS_MAX_WORKERS
+            )
+        else:
+            await asyncio.to_thread(blob.download_to_filename, str(local_path))
     
     async def _download_from_url(self, url: str, local_path: Path) -> None:
         """
         Download video from direct URL.
+        The destination directory is created once per request by the caller.
         
         Args:
             url: Video URL
             local_path: Local destination path
         """
-        import httpx
-        
-        # Ensure directory exists
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Download with progress
-        async with httpx.AsyncClient() as client:
-            async with client.stream("GET", url) as response:
-                response.raise_for_status()
-                
-                async with aiofiles.open(local_path, "wb") as f:
-                    async for chunk in response.aiter_bytes():
-                        await f.write(chunk)
+        # Download with progress over the pooled client (reuses TCP/TLS connections)
+        client = self._get_http_client()
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            
+            # Unencoded bodies (the usual case for MP4) skip the decoder pass entirely
+            if response.headers.get("content-encoding", "identity") == "identity":
+                chunks = response.aiter_raw(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            else:
+                chunks = response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            
+            async with aiofiles.open(local_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
     
     async def _create_mock_video(self, local_path: Path) -> None:
         """
@@ -265,7 +348,8 @@ class VideoGenerator:
         number_of_videos: int = 1,
         person_generation: PersonGeneration = PersonGeneration.ALLOW_ADULT,
         enhance_prompt: bool = True,
-        max_concurrent: Optional[int] = None
+        max_concurrent: Optional[int] = None,
+        progress_callback: Optional[callable] = None
     ) -> List[List[Path]]:
         """
         Generate multiple videos from prompts concurrently.
@@ -278,64 +362,127 @@ class VideoGenerator:
             person_generation: Person generation setting
             enhance_prompt: Whether to enhance prompts
             max_concurrent: Maximum concurrent operations
+            progress_callback: Optional callback called with each prompt index as it is generated and downloaded
             
         Returns:
             List of video file path lists for each prompt
         """
         self.logger.info(f"Starting batch generation of {len(prompts)} prompts")
         
-        # Create requests
-        requests = []
-        for prompt in prompts:
-            request = VideoRequest(
-                prompt=prompt,
-                aspect_ratio=aspect_ratio,
-                duration=duration,
-                number_of_videos=number_of_videos,
-                person_generation=person_generation,
-                enhance_prompt=enhance_prompt
-            )
-            requests.append(request)
+        # Shared request settings (built once; prompts stay validated per request)
+        settings = dict(
+            aspect_ratio=aspect_ratio,
+            duration=duration,
+            number_of_videos=number_of_videos,
+            person_generation=person_generation,
+            enhance_prompt=enhance_prompt
+        )
         
-        # Generate videos
-        video_uri_lists = await self.client.batch_generate_videos(
+        # Duplicate prompts within this batch are generated once and share the videos
+        all_local_paths: List[List[Path]] = [[] for _ in prompts]
+        pending: Dict[tuple, List[int]] = {}
+        for i, prompt in enumerate(prompts):
+            pending.setdefault((prompt, *settings.values()), []).append(i)
+        
+        unique_keys = list(pending)
+        requests = VideoRequest.validate_batch([{"prompt": key[0], **settings} for key in unique_keys])
+        if len(requests) < len(prompts):
+            self.logger.info(f"Reusing results for {len(prompts) - len(requests)} repeated prompt(s)")
+        
+        def report_progress(index: int) -> None:
+            for i in pending[unique_keys[index]]:
+                progress_callback(i)
+        
+        # Downloads across prompts share one bound, independent of generation concurrency
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_downloads)
+        
+        await aiofiles.os.makedirs(self.config.output_dir, exist_ok=True)
+        stems = [self._default_stem() for _ in requests]
+        
+        async def download_bounded(i: int, j: int, uri: str, total: int) -> Path:
+            async with semaphore:
+                return await self._download_video(uri, requests[i], j, total, stems[i])
+        
+        async def download_all(i: int, video_uris: List[str]) -> List[Path]:
+            return list(await asyncio.gather(*(
+                download_bounded(i, j, uri, len(video_uris))
+                for j, uri in enumerate(video_uris)
+            )))
+        
+        # Generate videos, downloading each prompt's results while later prompts generate
+        results = await self.client.batch_generate_videos(
             requests, 
-            max_concurrent
+            max_concurrent,
+            report_progress if progress_callback else None,
+            on_complete=download_all
         )
         
-        # Download all videos
-        all_local_paths = []
-        for i, video_uris in enumerate(video_uri_lists):
-            local_paths = []
-            for j, uri in enumerate(video_uris):
-                request = requests[i]
-                local_path = await self._download_video(uri, request, j)
-                local_paths.append(local_path)
-            all_local_paths.append(local_paths)
+        for key, local_paths in zip(unique_keys, results):
+            for i in pending[key]:
+                all_local_paths[i] = list(local_paths)
         
         self.logger.success(f"Batch generation completed: {len(all_local_paths)} prompt results")
         return all_local_paths
     
-    def cleanup_old_videos(self, days_old: int = 7) -> int:
+    def _find_old_videos(self, cutoff_time: float) -> List[str]:
+        """
+        Collect video files last modified before the cutoff.
+        
+        Args:
+            cutoff_time: Epoch timestamp; older files are returned
+            
+        Returns:
+            Paths of the old video files
+        """
+        # Single scandir pass: cached dirent type, no Path per entry
+        try:
+            entries = os.scandir(self.config.output_dir)
+        except FileNotFoundError:
+            # Nothing generated yet
+            return []
+        with entries:
+            return [
+                entry.path for entry in entries
+                if entry.name.endswith(".mp4") and entry.is_file()
+                and entry.stat().st_mtime < cutoff_time
+            ]
+    
+    async def cleanup_old_videos_async(self, days_old: int = 7, max_workers: int = 32) -> int:
         """
-        Clean up old video files.
+        Clean up old video files, overlapping unlink calls in worker threads.
         
         Args:
             days_old: Remove files older than this many days
+            max_workers: Maximum concurrent unlink calls
             
         Returns:
             Number of files removed
         """
-        import time
-        
         cutoff_time = time.time() - (days_old * 24 * 60 * 60)
-        removed_count = 0
+        old_files = await asyncio.to_thread(self._find_old_videos, cutoff_time)
+        
+        semaphore = asyncio.Semaphore(max_workers)
         
-        for file_path in self.config.output_dir.glob("*.mp4"):
-            if file_path.stat().st_mtime < cutoff_time:
-                file_path.unlink()
-                removed_count += 1
-                self.logger.debug(f"Removed old file: {file_path}")
+        async def remove(path: str) -> None:
+            async with semaphore:
+                await asyncio.to_thread(os.unlink, path)
+            # Formatted by loguru only when DEBUG is enabled
+            self.logger.debug("Removed old file: {}", path)
+        
+        await asyncio.gather(*(remove(path) for path in old_files))
+        removed_count = len(old_files)
         
         self.logger.info(f"Cleaned up {removed_count} old video files")
         return removed_count
+    
+    def cleanup_old_videos(self, days_old: int = 7) -> int:
+        """
+        Synchronous wrapper for old video cleanup.
+        
+        Args:
+            days_old: Remove files older than this many days
+            
+        Returns:
+            Number of files removed
+        """
+        return asyncio.run(self.cleanup_old_videos_async(days_old))
@@ -4,9 +4,15 @@ Provides high-quality video generation using LTX-Video model.
 """
 
 import asyncio
+import functools
+import itertools
+import secrets
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 import torch
 from PIL import Image
 import numpy as np
@@ -14,6 +20,14 @@ from loguru import logger
 
 from ..models.config import VEOConfig, VideoRequest, AspectRatio, PersonGeneration
 from ..utils.logger import get_logger
+from .pipeline_utils import (
+    HostFrameBuffer, attention_context, compile_pipeline, enable_memory_efficient_attention,
+    enable_sdpa_attention, enable_vae_tiling, is_cuda,
+    pipeline_dtype, quantize_pipeline
+)
+
+# Processed input images kept per client
+IMAGE_CACHE_SIZE = 16
 
 
 class LTXVideoClient:
@@ -21,51 +35,135 @@ class LTXVideoClient:
     LTX-Video client for high-quality video generation.
     """
     
-    def __init__(self, config: VEOConfig):
+    # Candidate models, tried in order until one loads
+    MODEL_NAMES = (
+        "Wan-AI/Wan2.1-T2V-1.3B-Diffusers",  # Working model
+        "Wan-AI/Wan2.1-T2V-14B-Diffusers",   # Alternative
+        "zai-org/CogVideoX-2b"               # Fallback
+    )
+    
+    # (width, height) per aspect ratio; unknown ratios fall back to landscape
+    RESOLUTIONS = {
+        AspectRatio.LANDSCAPE: (1216, 704),  # LTX-Video recommended landscape
+        AspectRatio.PORTRAIT: (704, 1216),   # LTX-Video recommended portrait
+        AspectRatio.SQUARE: (1024, 1024),    # Square resolution
+    }
+    
+    # Loaded (quantized/compiled) pipelines shared by all clients, keyed by _pipeline_key()
+    _pipeline_cache: Dict[Tuple, Any] = {}
+    
+    # Guards the class-level caches; a thread lock, since clients may run on
+    # several event loops (CLI runners, generate_video_sync, PromptManager)
+    _cache_lock = threading.Lock()
+    
+    # One single-thread executor per cached pipeline, so calls on a shared
+    # pipeline are serialized and always made from the same host thread
+    _executors: Dict[Tuple, ThreadPoolExecutor] = {}
+    
+    # Output file numbering, shared by all clients (and GPUs) of the process
+    _run_id = int(time.time())
+    _video_counter = itertools.count()
+    
+    # Cleared after the first failed NVENC encode so later videos go straight to OpenCV
+    _nvenc_available = True
+    
+    def __init__(self, config: VEOConfig, device: Optional[str] = None):
         """
         Initialize LTX-Video client.
         
         Args:
             config: VEO configuration
+            device: Torch device to run on (defaults to "cuda" when available, else "cpu")
         """
         self.config = config
         self.logger = get_logger("ltx.video")
         self.pipeline = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        
+        # Pinned staging buffer for decoded frames (reused across batches)
+        self._host_frames = HostFrameBuffer()
+        
+        # Output directories already created by this client
+        self._created_dirs: set = set()
+        
+        # Processed input images by (path, mtime, size), most recently used last
+        self._image_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        
+        # One client per GPU for multi-GPU requests; each client runs its pipeline
+        # on the pipeline's dedicated thread (see _get_executor), off the event loop
+        self._device_clients: Optional[List["LTXVideoClient"]] = None
         
         self.logger.info(f"LTX-Video client initialized on device: {self.device}")
     
+    def _pipeline_key(self) -> Tuple:
+        """
+        Get the cache key identifying an equivalent loaded pipeline.
+        """
+        return (
+            self.MODEL_NAMES,
+            str(pipeline_dtype(self.device)),
+            self.device,
+            self.config.quantize,
+            self.config.compile_model,
+        )
+    
     async def initialize_pipeline(self):
         """
-        Initialize the LTX-Video pipeline.
+        Initialize the LTX-Video pipeline, reusing one already loaded by another client.
         """
         if self.pipeline is not None:
             return
         
+        # Loading (and quantization calibration / compile warm-up) takes minutes:
+        # run it on the pipeline's thread, which also replays the captured graphs
+        self.pipeline = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), self._get_or_load_pipeline
+        )
+    
+    def _get_or_load_pipeline(self) -> Any:
+        """
+        Get the cached pipeline for this client's key, loading it on a miss.
+        
+        Runs on the key's single-thread executor, so loads of one pipeline never
+        overlap; pipelines for other keys (e.g. other GPUs) load in parallel.
+        
+        Returns:
+            The shared pipeline
+        """
+        key = self._pipeline_key()
+        with self._cache_lock:
+            cached = self._pipeline_cache.get(key)
+        if cached is not None:
+            self.logger.info("Reusing cached LTX-Video pipeline")
+            return cached
+        
+        self._load_pipeline()
+        with self._cache_lock:
+            self._pipeline_cache[key] = self.pipeline
+        return self.pipeline
+    
+    def _load_pipeline(self):
+        """
+        Load the LTX-Video pipeline from disk and apply CUDA optimizations.
+        """
         try:
             from diffusers import StableVideoDiffusionPipeline
             
             self.logger.info("Loading LTX-Video pipeline...")
             
             # Load the pipeline - use working models
-            model_names = [
-                "Wan-AI/Wan2.1-T2V-1.3B-Diffusers",  # Working model
-                "Wan-AI/Wan2.1-T2V-14B-Diffusers",   # Alternative
-                "zai-org/CogVideoX-2b"               # Fallback
-            ]
-            
             pipeline_loaded = False
-            for model_name in model_names:
+            for model_name in self.MODEL_NAMES:
                 try:
                     self.logger.info(f"Trying to load model: {model_name}")
                     self.pipeline = StableVideoDiffusionPipeline.from_pretrained(
                         model_name,
-                        torch_dtype=torch.float32,  # Always use float32 for CPU
-                        device_map=None,  # No device mapping for CPU
+                        torch_dtype=pipeline_dtype(self.device),  # fp16 on CUDA, fp32 on CPU
+                        device_map=None,
                         use_safetensors=True,
-                        low_cpu_mem_usage=True,
-                        variant="fp16" if self.device == "cuda" else None
+                        low_cpu_mem_usage=True
                     )
+                    self.pipeline = self.pipeline.to(self.device)
                     pipeline_loaded = True
                     self.logger.info(f"Successfully loaded model: {model_name}")
                     break
@@ -76,6 +174,18 @@ class LTXVideoClient:
             if not pipeline_loaded:
                 self.logger.warning("Failed to load any LTX-Video model, using mock pipeline")
                 self.pipeline = MockLTXPipeline()
+            elif is_cuda(self.device):
+                enable_vae_tiling(self.pipeline, self.logger)
+                enable_sdpa_attention(self.pipeline, self.logger)
+                if self.config.memory_efficient_attention:
+                    enable_memory_efficient_attention(self.pipeline, self.logger)
+                
+                # Quantize before compiling so Inductor sees the quantized graph
+                quantize_pipeline(self.pipeline, self.config.quantize, self._calibration_pass, self.logger)
+                if self.config.compile_model:
+                    # Static shapes come from _prepare_generation_params' resolution table
+                    compile_pipeline(self.pipeline, self.logger)
+                    self._warmup_compiled_shapes()
             
             self.logger.success("LTX-Video pipeline loaded successfully")
             
@@ -83,6 +193,41 @@ class LTXVideoClient:
             self.logger.error(f"Failed to load LTX-Video pipeline: {e}")
             raise
     
+    def _calibration_pass(self) -> None:
+        """
+        Run a short text-to-video pass used to calibrate quantization ranges.
+        """
+        width, height = self._get_resolution_from_aspect_ratio(AspectRatio.LANDSCAPE)
+        self.pipeline(
+            prompt="A calm landscape at golden hour, gentle camera movement",
+            height=height,
+            width=width,
+            num_frames=9,
+            num_inference_steps=2,
+        )
+    
+    def _warmup_compiled_shapes(self) -> None:
+        """
+        Compile the pipeline for each resolution bucket at load time.
+        
+        Requests always map to one of the fixed aspect-ratio resolutions and an
+        8k+1 frame count, so one single-step pass per resolution at the default
+        duration moves the usual recompilation stalls out of the first requests.
+        """
+        num_frames = self._calculate_frames(self.config.default_duration)
+        for aspect_ratio in AspectRatio:
+            width, height = self._get_resolution_from_aspect_ratio(aspect_ratio)
+            self.logger.info(f"Warming up compiled pipeline at {width}x{height}, {num_frames} frames")
+            with torch.inference_mode(), self._attention_context():
+                self.pipeline(
+                    prompt="A calm landscape at golden hour, gentle camera movement",
+                    height=height,
+                    width=width,
+                    num_frames=num_frames,
+                    num_inference_steps=1,
+                    output_type="pt",
+                )
+    
     async def generate_video_async(
         self, 
         request: VideoRequest,
@@ -104,32 +249,52 @@ class LTXVideoClient:
             # Initialize pipeline if needed
             await self.initialize_pipeline()
             
-            if progress_callback:
-                progress_callback({"status": "initializing", "progress": 10})
+            self._notify(progress_callback, {"status": "initializing", "progress": 10})
             
-            # Prepare generation parameters
-            generation_params = self._prepare_generation_params(request)
+            # Prepare generation parameters (image decoding runs off the event loop)
+            loop = asyncio.get_running_loop()
+            generation_params = await loop.run_in_executor(
+                self._get_executor(), self._prepare_generation_params, request
+            )
             
-            if progress_callback:
-                progress_callback({"status": "generating", "progress": 25})
+            self._notify(progress_callback, {"status": "generating", "progress": 25})
             
-            # Generate videos
-            video_paths = []
-            for i in range(request.number_of_videos):
-                if progress_callback:
-                    progress_callback({
-                        "status": "generating", 
-                        "progress": 25 + (i * 50 // request.number_of_videos)
-                    })
-                
-                # Generate single video
-                video_path = await self._generate_single_video(
-                    request, generation_params, i
+            if request.number_of_videos > 1 and len(self._get_device_clients()) > 1:
+                video_paths = await self._generate_across_devices(
+                    request, generation_params, progress_callback
                 )
-                video_paths.append(video_path)
+                
+                self._notify(progress_callback, {"status": "completed", "progress": 100})
+                
+                self.logger.success(f"Generated {len(video_paths)} video(s) successfully")
+                return video_paths
             
-            if progress_callback:
-                progress_callback({"status": "completed", "progress": 100})
+            # Generate videos, all of a request's videos in one batched pipeline call
+            # (falls back to one video per call if the batch does not fit in GPU memory)
+            video_paths = []
+            batch_size = request.number_of_videos
+            while len(video_paths) < request.number_of_videos:
+                start = len(video_paths)
+                count = min(batch_size, request.number_of_videos - start)
+                self._notify(progress_callback, {
+                    "status": "generating", 
+                    "progress": 25 + (start * 50 // request.number_of_videos)
+                })
+                
+                try:
+                    video_paths.extend(await loop.run_in_executor(
+                        self._get_executor(), self._generate_videos,
+                        request, generation_params, start, count,
+                        self._step_callback(progress_callback, generation_params, start, count, request.number_of_videos)
+                    ))
+                except torch.cuda.OutOfMemoryError:
+                    if count == 1:
+                        raise
+                    self.logger.warning(f"Out of GPU memory generating {count} videos at once, retrying one per call")
+                    torch.cuda.empty_cache()
+                    batch_size = 1
+            
+            self._notify(progress_callback, {"status": "completed", "progress": 100})
             
             self.logger.success(f"Generated {len(video_paths)} video(s) successfully")
             return video_paths
@@ -161,12 +326,12 @@ class LTXVideoClient:
             "num_frames": num_frames,
             "guidance_scale": 3.5,
             "num_inference_steps": 40,
-            "seed": int(time.time()) % 2**32,
+            "seed": secrets.randbits(32),
         }
         
         # Add image if provided
         if request.image_path:
-            params["image"] = self._load_image(request.image_path)
+            params["image"] = self._load_image_cached(request.image_path)
         else:
             # Create a specific image for the interbox_emotivo prompt
             if "interbox" in request.prompt.lower():
@@ -184,14 +349,7 @@ class LTXVideoClient:
         Returns:
             (width, height) tuple
         """
-        if aspect_ratio == AspectRatio.LANDSCAPE:
-            return (1216, 704)  # LTX-Video recommended landscape
-        elif aspect_ratio == AspectRatio.PORTRAIT:
-            return (704, 1216)  # LTX-Video recommended portrait
-        elif aspect_ratio == AspectRatio.SQUARE:
-            return (1024, 1024)  # Square resolution
-        else:
-            return (1216, 704)  # Default landscape
+        return self.RESOLUTIONS.get(aspect_ratio, self.RESOLUTIONS[AspectRatio.LANDSCAPE])
     
     def _calculate_frames(self, duration_seconds: int) -> int:
         """
@@ -215,6 +373,31 @@ class LTXVideoClient:
         
         return frames
     
+    def _load_image_cached(self, image_path: Path) -> Image.Image:
+        """
+        Load an input image, reusing the processed result while the file is unchanged.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            Processed image, as returned by _load_image
+        """
+        stat = image_path.stat()
+        key = (str(image_path), stat.st_mtime_ns, stat.st_size)
+        
+        image = self._image_cache.get(key)
+        if image is None:
+            image = self._load_image(image_path)
+            self._image_cache[key] = image
+            if len(self._image_cache) > IMAGE_CACHE_SIZE:
+                self._image_cache.popitem(last=False)
+        else:
+            self._image_cache.move_to_end(key)
+        
+        # PIL images are mutable: hand out a copy
+        return image.copy()
+    
     def _load_image(self, image_path: Path) -> Image.Image:
         """
         Load and process image for LTX-Video.
@@ -226,18 +409,22 @@ class LTXVideoClient:
             Processed PIL Image
         """
         try:
+            max_size = 1024
+            
             image = Image.open(image_path)
             
+            # Let JPEG decoders downscale while decoding (no-op for other formats)
+            image.draft('RGB', (max_size, max_size))
+            
             # Convert to RGB if necessary
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             
-            # Resize if needed (LTX-Video works best with specific resolutions)
-            max_size = 1024
-            if max(image.size) > max_size:
-                ratio = max_size / max(image.size)
-                new_size = tuple(int(dim * ratio) for dim in image.size)
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
+            # Resize if needed (LTX-Video works best with specific resolutions);
+            # thumbnail() resizes in place, keeps the aspect ratio and (with
+            # reducing_gap) box-reduces large sources before the LANCZOS pass.
+            # It is a no-op for images already within max_size
+            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS, reducing_gap=3.0)
             
             return image
             
@@ -251,121 +438,274 @@ class LTXVideoClient:
         Represents a cozy living room with a phone on a sofa arm.
         
         Returns:
-            Interbox-specific PIL Image
+            Interbox-specific PIL Image (a copy of the cached conditioning image)
+        """
+        return _interbox_image().copy()
+    
+    def _get_device_clients(self) -> List["LTXVideoClient"]:
         """
-        width, height = 1024, 576
-        image = Image.new('RGB', (width, height), color=(220, 200, 180))  # Warm beige background
+        Get one client per visible GPU, this client serving the first one.
         
-        from PIL import ImageDraw, ImageFont
-        draw = ImageDraw.Draw(image)
+        Returns:
+            Clients to spread a request's videos over (just this one on single-GPU/CPU hosts)
+        """
+        if self._device_clients is None:
+            self._device_clients = [self]
+            if is_cuda(self.device):
+                self._device_clients += [
+                    LTXVideoClient(self.config, device=f"cuda:{index}")
+                    for index in range(1, torch.cuda.device_count())
+                ]
+        return self._device_clients
+    
+    async def _generate_across_devices(
+        self,
+        request: VideoRequest,
+        params: Dict[str, Any],
+        progress_callback: Optional[callable] = None
+    ) -> List[str]:
+        """
+        Generate a request's videos in parallel, one video at a time per GPU.
         
-        # Create a cozy living room scene
-        # Sofa arm (bottom right)
-        sofa_color = (139, 69, 19)  # Brown
-        sofa_rect = [width*0.6, height*0.7, width*0.95, height*0.9]
-        draw.rectangle(sofa_rect, fill=sofa_color)
+        Video indices are queued and each GPU's worker takes the next one as
+        soon as it is free, so faster devices pick up more of the work.
         
-        # Phone on sofa arm
-        phone_color = (50, 50, 50)  # Dark gray
-        phone_rect = [width*0.7, height*0.75, width*0.85, height*0.85]
-        draw.rectangle(phone_rect, fill=phone_color)
+        Args:
+            request: Video generation request
+            params: Generation parameters
+            progress_callback: Optional progress callback
+            
+        Returns:
+            Paths to generated videos, in index order
+        """
+        clients = self._get_device_clients()
+        for client in clients:
+            await client.initialize_pipeline()
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in range(request.number_of_videos):
+            queue.put_nowait(index)
+        
+        loop = asyncio.get_running_loop()
+        results: Dict[int, str] = {}
+        
+        async def worker(client: "LTXVideoClient"):
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                paths = await loop.run_in_executor(
+                    client._get_executor(), client._generate_videos, request, params, index, 1
+                )
+                results[index] = paths[0]
+                self._notify(progress_callback, {
+                    "status": "generating",
+                    "progress": 25 + (len(results) * 50 // request.number_of_videos)
+                })
+        
+        self.logger.info(f"Spreading {request.number_of_videos} videos over {len(clients)} GPUs")
+        await asyncio.gather(*(worker(client) for client in clients))
+        return [results[index] for index in range(request.number_of_videos)]
+    
+    def _attention_context(self):
+        """
+        Get the attention backend context for this client's pipeline calls.
+        """
+        return attention_context(self.config.memory_efficient_attention and is_cuda(self.device))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the single-thread executor this client's pipeline calls run on.
+        
+        Executors are shared under the _pipeline_key() of the cached pipeline,
+        so clients reusing one pipeline never run it from two threads at once.
+        """
+        key = self._pipeline_key()
+        with self._cache_lock:
+            executor = self._executors.get(key)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ltx-{self.device}")
+                self._executors[key] = executor
+        return executor
+    
+    def _ensure_dir(self, directory: Path) -> None:
+        """
+        Create an output directory once per client instead of once per video.
         
-        # Phone screen (lighter)
-        screen_rect = [width*0.72, height*0.77, width*0.83, height*0.83]
-        draw.rectangle(screen_rect, fill=(20, 20, 20))
+        Args:
+            directory: Directory to create
+        """
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+    
+    @staticmethod
+    def _notify(progress_callback: Optional[callable], event: Dict[str, Any]) -> None:
+        """
+        Schedule a progress event on the running loop instead of calling back inline.
         
-        # TV in background (blurred effect)
-        tv_color = (30, 30, 30)
-        tv_rect = [width*0.1, height*0.1, width*0.4, height*0.3]
-        draw.rectangle(tv_rect, fill=tv_color)
+        The callback runs on the next loop iteration, so slow callbacks (e.g. a
+        websocket push) never delay generation.
+        
+        Args:
+            progress_callback: Progress callback of the request (None disables reporting)
+            event: Progress event
+        """
+        if progress_callback is not None:
+            asyncio.get_running_loop().call_soon(progress_callback, event)
+    
+    def _step_callback(
+        self,
+        progress_callback: Optional[callable],
+        params: Dict[str, Any],
+        first_index: int,
+        count: int,
+        total: int
+    ) -> Optional[callable]:
+        """
+        Build a denoising step callback that reports progress back on the event loop.
+        
+        Args:
+            progress_callback: Progress callback of the request (None disables reporting)
+            params: Generation parameters
+            first_index: Index of the first video in the batch
+            count: Number of videos in the batch
+            total: Number of videos in the request
+            
+        Returns:
+            Callback for the pipeline's ``callback_on_step_end`` argument, or None
+        """
+        if progress_callback is None:
+            return None
         
-        # Window light (warm golden hour)
-        window_light = (255, 223, 186)  # Warm light
-        light_rect = [width*0.05, height*0.05, width*0.3, height*0.4]
-        draw.rectangle(light_rect, fill=window_light)
+        loop = asyncio.get_running_loop()
+        steps = params["num_inference_steps"]
         
-        # Add some texture to the sofa
-        for i in range(10):
-            x = width*0.6 + i * (width*0.35 // 10)
-            y = height*0.7
-            draw.line([x, y, x, height*0.9], fill=(100, 50, 25), width=2)
+        def on_step_end(pipeline, step, timestep, callback_kwargs):
+            done = first_index + count * (step + 1) / steps
+            loop.call_soon_threadsafe(progress_callback, {
+                "status": "generating",
+                "progress": 25 + int(done * 50 / total)
+            })
+            return callback_kwargs
         
-        return image
+        return on_step_end
     
-    async def _generate_single_video(
+    def _generate_videos(
         self, 
         request: VideoRequest, 
         params: Dict[str, Any], 
-        video_index: int
-    ) -> str:
+        first_index: int,
+        count: int,
+        step_callback: Optional[callable] = None
+    ) -> List[str]:
         """
-        Generate a single video using LTX-Video.
+        Generate a batch of videos with a single LTX-Video pipeline call.
+        
+        Runs synchronously; callers dispatch it to the client's executor.
         
         Args:
             request: Video generation request
             params: Generation parameters
-            video_index: Index of video being generated
+            first_index: Index of the first video in the batch (offsets the seed)
+            count: Number of videos to generate in this call
+            step_callback: Optional per-denoising-step callback
             
         Returns:
-            Path to generated video
+            Paths to generated videos
         """
-        # Generate unique filename
-        timestamp = int(time.time())
-        video_filename = f"ltx_video_{timestamp}_{video_index}.mp4"
-        video_path = self.config.output_dir / video_filename
+        # Generate unique filenames
+        video_paths = [
+            self.config.output_dir / f"ltx_video_{self._run_id}_{next(self._video_counter)}.mp4"
+            for _ in range(count)
+        ]
         
         try:
-            # Generate video using LTX-Video pipeline
-            if "image" in params:
-                # Image-to-video generation
-                video = self.pipeline(
-                    prompt=params["prompt"],
-                    image=params["image"],
-                    height=params["height"],
-                    width=params["width"],
-                    num_frames=params["num_frames"],
-                    guidance_scale=params["guidance_scale"],
-                    num_inference_steps=params["num_inference_steps"],
-                    generator=torch.Generator().manual_seed(params["seed"]),
-                ).frames
-            else:
-                # Text-to-video generation
-                video = self.pipeline(
-                    prompt=params["prompt"],
-                    height=params["height"],
-                    width=params["width"],
-                    num_frames=params["num_frames"],
-                    guidance_scale=params["guidance_scale"],
-                    num_inference_steps=params["num_inference_steps"],
-                    generator=torch.Generator().manual_seed(params["seed"]),
-                ).frames
-            
-            # Save video
-            self._save_video(video, video_path)
-            
-            self.logger.info(f"Generated video: {video_path}")
-            return f"file://{video_path.absolute()}"
-            
+            # Generate videos using LTX-Video pipeline; noise is sampled on the
+            # pipeline's device and autograd bookkeeping is disabled
+            # (offset by the first index so separate calls never repeat the same noise)
+            generator = torch.Generator(device=self.device).manual_seed(
+                (params["seed"] + first_index) % 2**32
+            )
+            # On CUDA keep decoded frames as GPU tensors and stage them through pinned memory
+            output_type = "pt" if is_cuda(self.device) else "pil"
+            with torch.inference_mode(), self._attention_context():
+                if "image" in params:
+                    # Image-to-video generation
+                    videos = self.pipeline(
+                        prompt=params["prompt"],
+                        image=params["image"],
+                        height=params["height"],
+                        width=params["width"],
+                        num_frames=params["num_frames"],
+                        guidance_scale=params["guidance_scale"],
+                        num_inference_steps=params["num_inference_steps"],
+                        num_videos_per_prompt=count,
+                        output_type=output_type,
+                        callback_on_step_end=step_callback,
+                        generator=generator,
+                    ).frames
+                else:
+                    # Text-to-video generation
+                    videos = self.pipeline(
+                        prompt=params["prompt"],
+                        height=params["height"],
+                        width=params["width"],
+                        num_frames=params["num_frames"],
+                        guidance_scale=params["guidance_scale"],
+                        num_inference_steps=params["num_inference_steps"],
+                        num_videos_per_prompt=count,
+                        output_type=output_type,
+                        callback_on_step_end=step_callback,
+                        generator=generator,
+                    ).frames
+            
+            videos = self._host_frames.to_numpy(videos)
+            
+            # Save videos (the pipeline returns one frame sequence per video)
+            for frames, video_path in zip(videos, video_paths):
+                self._save_video(frames, video_path)
+                self.logger.info(f"Generated video: {video_path}")
+            return [f"file://{video_path.absolute()}" for video_path in video_paths]
+            
+        except torch.cuda.OutOfMemoryError:
+            raise
         except Exception as e:
-            self.logger.error(f"Failed to generate video {video_index}: {e}")
+            self.logger.error(f"Failed to generate videos {first_index}-{first_index + count - 1}: {e}")
             raise
     
-    def _save_video(self, frames: List[np.ndarray], output_path: Path):
+    def _save_video(self, frames: np.ndarray, output_path: Path):
         """
         Save video frames to MP4 file.
         
         Args:
-            frames: List of video frames as numpy arrays
+            frames: (T, H, W, 3) uint8 RGB frames (a list of frames is stacked once)
             output_path: Output file path
         """
+        if self._nvenc_available and is_cuda(self.device):
+            try:
+                self._save_video_nvenc(frames, output_path)
+                return
+            except ImportError:
+                self.logger.warning("PyAV not available, encoding with OpenCV")
+                LTXVideoClient._nvenc_available = False
+            except Exception as e:
+                self.logger.warning(f"NVENC encoding failed ({e}), encoding with OpenCV")
+                LTXVideoClient._nvenc_available = False
+        
         try:
             import cv2
             
             # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(output_path.parent)
+            
+            # (T, H, W, 3) RGB array; stacks frame lists once, no copy for arrays
+            video = np.asarray(frames)
             
             # Get video properties
-            height, width, channels = frames[0].shape
+            height, width = video.shape[1:3]
             fps = 30
             
             # Create video writer
@@ -376,12 +716,18 @@ class LTXVideoClient:
                 fps, 
                 (width, height)
             )
-            
-            # Write frames
-            for frame in frames:
-                # Convert RGB to BGR for OpenCV
-                frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                out.write(frame_bgr)
+            if not out.isOpened():
+                # The cached directory may have been removed since it was created
+                self._created_dirs.discard(output_path.parent)
+                self._ensure_dir(output_path.parent)
+                out.open(str(output_path), fourcc, fps, (width, height))
+                if not out.isOpened():
+                    raise RuntimeError(f"Could not open video writer for {output_path}")
+            
+            # Write frames: RGB -> BGR is a channel-reversed view over the whole clip,
+            # materialized one contiguous frame at a time for OpenCV
+            for frame_bgr in video[..., ::-1]:
+                out.write(np.ascontiguousarray(frame_bgr))
             
             # Release video writer
             out.release()
@@ -395,12 +741,45 @@ class LTXVideoClient:
             self.logger.error(f"Failed to save video: {e}")
             raise
     
-    def _save_video_fallback(self, frames: List[np.ndarray], output_path: Path):
+    def _save_video_nvenc(self, frames: np.ndarray, output_path: Path):
+        """
+        Save video frames to MP4 file with the GPU's NVENC H.264 encoder (via PyAV).
+        
+        Args:
+            frames: (T, H, W, 3) uint8 RGB frames (a list of frames is stacked once)
+            output_path: Output file path
+        """
+        import av
+        
+        # Ensure output directory exists
+        self._ensure_dir(output_path.parent)
+        
+        # (T, H, W, 3) RGB array; stacks frame lists once, no copy for arrays
+        video = np.asarray(frames)
+        height, width = video.shape[1:3]
+        
+        with av.open(str(output_path), mode="w") as container:
+            stream = container.add_stream("h264_nvenc", rate=30)
+            stream.width = width
+            stream.height = height
+            stream.pix_fmt = "yuv420p"
+            
+            for frame in video:
+                for packet in stream.encode(av.VideoFrame.from_ndarray(frame, format="rgb24")):
+                    container.mux(packet)
+            
+            # Flush frames still buffered in the encoder
+            for packet in stream.encode():
+                container.mux(packet)
+        
+        self.logger.info(f"Video saved (NVENC): {output_path}")
+    
+    def _save_video_fallback(self, frames: np.ndarray, output_path: Path):
         """
         Fallback method to save video using PIL.
         
         Args:
-            frames: List of video frames as numpy arrays
+            frames: (T, H, W, 3) uint8 RGB frames (a list of frames is stacked once)
             output_path: Output file path
         """
         try:
@@ -443,12 +822,60 @@ class LTXVideoClient:
         }
 
 
+@functools.lru_cache(maxsize=1)
+def _interbox_image() -> Image.Image:
+    """
+    Draw the static interbox_emotivo conditioning image once per process.
+    
+    Returns:
+        Interbox-specific PIL Image
+    """
+    width, height = 1024, 576
+    image = Image.new('RGB', (width, height), color=(220, 200, 180))  # Warm beige background
+    
+    from PIL import ImageDraw, ImageFont
+    draw = ImageDraw.Draw(image)
+    
+    # Create a cozy living room scene
+    # Sofa arm (bottom right)
+    sofa_color = (139, 69, 19)  # Brown
+    sofa_rect = [width*0.6, height*0.7, width*0.95, height*0.9]
+    draw.rectangle(sofa_rect, fill=sofa_color)
+    
+    # Phone on sofa arm
+    phone_color = (50, 50, 50)  # Dark gray
+    phone_rect = [width*0.7, height*0.75, width*0.85, height*0.85]
+    draw.rectangle(phone_rect, fill=phone_color)
+    
+    # Phone screen (lighter)
+    screen_rect = [width*0.72, height*0.77, width*0.83, height*0.83]
+    draw.rectangle(screen_rect, fill=(20, 20, 20))
+    
+    # TV in background (blurred effect)
+    tv_color = (30, 30, 30)
+    tv_rect = [width*0.1, height*0.1, width*0.4, height*0.3]
+    draw.rectangle(tv_rect, fill=tv_color)
+    
+    # Window light (warm golden hour)
+    window_light = (255, 223, 186)  # Warm light
+    light_rect = [width*0.05, height*0.05, width*0.3, height*0.4]
+    draw.rectangle(light_rect, fill=window_light)
+    
+    # Add some texture to the sofa
+    for i in range(10):
+        x = width*0.6 + i * (width*0.35 // 10)
+        y = height*0.7
+        draw.line([x, y, x, height*0.9], fill=(100, 50, 25), width=2)
+    
+    return image
+
+
 class MockLTXPipeline:
     """
     Mock LTX-Video pipeline for when the real package is not available.
     """
     
-    def __call__(self, **kwargs):
-        # Return mock frames
-        frames = [np.random.randint(0, 255, (576, 1024, 3), dtype=np.uint8) for _ in range(25)]
+    def __call__(self, num_videos_per_prompt: int = 1, **kwargs):
+        # Return mock frames as one contiguous (videos, T, H, W, 3) uint8 buffer
+        frames = np.random.randint(0, 255, (num_videos_per_prompt, 25, 576, 1024, 3), dtype=np.uint8)
         return type('MockResult', (), {'frames': frames})()
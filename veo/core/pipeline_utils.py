@@ -0,0 +1,263 @@
+"""
+Shared inference optimizations for the diffusers pipelines used by the video clients.
+"""
+
+import contextlib
+import os
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+
+import torch
+
+# Allow TF32 tensor cores for fp32 matmuls (no-op on CPU)
+torch.set_float32_matmul_precision("high")
+
+# Fixed resolutions per aspect ratio: let cuDNN autotune conv algorithms once per shape
+torch.backends.cudnn.benchmark = True
+
+# Prefer fused scaled-dot-product attention kernels (cuDNN where the build has it)
+if hasattr(torch.backends.cuda, "enable_cudnn_sdp"):
+    torch.backends.cuda.enable_cudnn_sdp(True)
+torch.backends.cuda.enable_flash_sdp(True)
+torch.backends.cuda.enable_mem_efficient_sdp(True)
+
+# Pipeline components holding the denoising network, by pipeline family
+DENOISER_ATTRIBUTES = ("transformer", "unet")
+
+# Persistent Inductor cache, so compiled kernels survive process restarts
+INDUCTOR_CACHE_DIR = Path.home() / ".cache" / "veo" / "inductor"
+
+
+def is_cuda(device: str) -> bool:
+    """
+    Check whether a device string ("cuda", "cuda:1", "cpu", ...) names a GPU.
+    """
+    return torch.device(device).type == "cuda"
+
+
+def pipeline_dtype(device: str) -> torch.dtype:
+    """
+    Get the weight dtype for a pipeline running on the given device.
+    
+    Args:
+        device: Target device ("cuda", "cuda:<index>" or "cpu")
+    
+    Returns:
+        torch.float16 on CUDA, torch.float32 otherwise
+    """
+    return torch.float16 if is_cuda(device) else torch.float32
+
+
+class HostFrameBuffer:
+    """
+    Pinned host buffer used to bring decoded video frames off the GPU.
+    
+    Frames are converted to uint8 (T, H, W, 3) on the device, then copied into
+    page-locked memory with a non-blocking copy on a dedicated stream. The
+    buffer is reused while the batch shape stays the same; arrays returned by
+    to_numpy alias it and are only valid until the next call.
+    """
+    
+    def __init__(self):
+        self._buffer: Optional[torch.Tensor] = None
+        self._stream = None
+    
+    def to_numpy(self, videos: Any) -> Any:
+        """
+        Convert pipeline output frames to per-video uint8 numpy arrays.
+        
+        Args:
+            videos: Pipeline ``frames`` output; CUDA tensors shaped (B, T, C, H, W)
+                in [0, 1] are transferred, anything else is returned unchanged
+                
+        Returns:
+            List of (T, H, W, 3) uint8 arrays, or the original frames
+        """
+        if not (isinstance(videos, torch.Tensor) and videos.is_cuda):
+            return videos
+        
+        frames = (videos.clamp(0, 1) * 255).round().to(torch.uint8).permute(0, 1, 3, 4, 2)
+        if self._buffer is None or self._buffer.shape != frames.shape:
+            self._buffer = torch.empty(frames.shape, dtype=torch.uint8, pin_memory=True)
+            self._stream = torch.cuda.Stream(device=frames.device)
+        
+        # Copy on a side stream once the conversion kernels have been queued
+        self._stream.wait_stream(torch.cuda.current_stream(frames.device))
+        with torch.cuda.stream(self._stream):
+            self._buffer.copy_(frames, non_blocking=True)
+        self._stream.synchronize()
+        
+        host = self._buffer.numpy()
+        return [host[i] for i in range(host.shape[0])]
+
+
+def enable_vae_tiling(pipeline: Any, logger) -> None:
+    """
+    Decode latents in tiles and per-sample slices to bound VAE peak memory.
+    
+    Keeps long clips (up to 257 frames) and batched requests from running out
+    of memory in the decoder, which runs after the last denoising step.
+    
+    Args:
+        pipeline: Loaded diffusers pipeline
+        logger: Logger of the owning client
+    """
+    vae = getattr(pipeline, "vae", None)
+    for method in ("enable_tiling", "enable_slicing"):
+        if hasattr(vae, method):
+            getattr(vae, method)()
+            logger.info(f"VAE {method.removeprefix('enable_')} enabled")
+
+
+def enable_sdpa_attention(pipeline: Any, logger) -> None:
+    """
+    Route legacy attention processors through fused scaled-dot-product attention.
+    
+    Diffusers' plain ``AttnProcessor`` materializes the full QK^T score tensor
+    (baddbmm + softmax + bmm); ``AttnProcessor2_0`` calls
+    F.scaled_dot_product_attention, which dispatches to the flash / cuDNN /
+    memory-efficient kernels enabled above. Model-specific processors (rotary
+    embeddings, joint attention, ...) are left as they are.
+    
+    Args:
+        pipeline: Loaded diffusers pipeline
+        logger: Logger of the owning client
+    """
+    from diffusers.models.attention_processor import AttnProcessor, AttnProcessor2_0
+    
+    for attribute in DENOISER_ATTRIBUTES:
+        module = getattr(pipeline, attribute, None)
+        if not hasattr(module, "set_attn_processor"):
+            continue
+        
+        processors = module.attn_processors
+        legacy = [name for name, processor in processors.items() if type(processor) is AttnProcessor]
+        if legacy:
+            module.set_attn_processor({
+                name: AttnProcessor2_0() if name in legacy else processor
+                for name, processor in processors.items()
+            })
+            logger.info(f"Switched {len(legacy)} {attribute} attention processors to SDPA")
+
+
+def enable_memory_efficient_attention(pipeline: Any, logger) -> None:
+    """
+    Switch the pipeline to xFormers memory-efficient attention when installed.
+    
+    Without xFormers, attention_context() still keeps SDPA on its tiled fused
+    kernels.
+    
+    Args:
+        pipeline: Loaded diffusers pipeline
+        logger: Logger of the owning client
+    """
+    try:
+        pipeline.enable_xformers_memory_efficient_attention()
+    except Exception as e:
+        logger.warning(f"xFormers attention unavailable ({e}); using fused SDPA kernels only")
+        return
+    logger.info("xFormers memory-efficient attention enabled")
+
+
+def attention_context(fused_only: bool) -> contextlib.AbstractContextManager:
+    """
+    Context for pipeline calls, optionally excluding the math SDPA backend.
+    
+    The math fallback materializes the full attention matrix, which for long
+    video token sequences is the dominant memory traffic; the flash, cuDNN and
+    memory-efficient kernels work on tiles instead.
+    
+    Args:
+        fused_only: Restrict scaled_dot_product_attention to fused kernels
+    
+    Returns:
+        The SDPA backend context, or a no-op context
+    """
+    if not fused_only:
+        return contextlib.nullcontext()
+    
+    try:
+        from torch.nn.attention import SDPBackend, sdpa_kernel
+    except ImportError:
+        # PyTorch < 2.3
+        return torch.backends.cuda.sdp_kernel(enable_flash=True, enable_mem_efficient=True, enable_math=False)
+    
+    backends = [SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION]
+    if hasattr(SDPBackend, "CUDNN_ATTENTION"):
+        backends.append(SDPBackend.CUDNN_ATTENTION)
+    return sdpa_kernel(backends)
+
+
+def compile_pipeline(pipeline: Any, logger) -> None:
+    """
+    Compile the pipeline's denoising network with torch.compile.
+    
+    Uses the "reduce-overhead" mode so Inductor-fused kernels are replayed
+    through CUDA graphs, removing per-step kernel launch overhead. Compilation
+    itself happens lazily on the first call with a given input shape; compiled
+    graphs are cached on disk (TORCHINDUCTOR_CACHE_DIR, defaulting to
+    INDUCTOR_CACHE_DIR) and reused by later processes.
+    
+    Args:
+        pipeline: Loaded diffusers pipeline (mock pipelines are left untouched)
+        logger: Logger of the owning client
+    """
+    import torch._inductor.config as inductor_config
+    
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(INDUCTOR_CACHE_DIR))
+    inductor_config.fx_graph_cache = True
+    inductor_config.conv_1x1_as_mm = True
+    
+    for attribute in DENOISER_ATTRIBUTES:
+        module = getattr(pipeline, attribute, None)
+        if isinstance(module, torch.nn.Module):
+            setattr(pipeline, attribute, torch.compile(module, mode="reduce-overhead", dynamic=False))
+            logger.info(f"Compiled pipeline {attribute} with torch.compile (reduce-overhead)")
+    
+    vae = getattr(pipeline, "vae", None)
+    if isinstance(vae, torch.nn.Module):
+        vae.decode = torch.compile(vae.decode, mode="reduce-overhead", dynamic=False)
+        logger.info("Compiled pipeline VAE decoder with torch.compile (reduce-overhead)")
+
+
+# ModelOpt quantization config names per VEOConfig.quantize mode
+QUANTIZATION_CONFIGS = {
+    "fp8": "FP8_DEFAULT_CFG",
+    "nvfp4": "NVFP4_DEFAULT_CFG",
+    "int8": "INT8_SMOOTHQUANT_CFG",
+}
+
+
+def quantize_pipeline(
+    pipeline: Any,
+    mode: Literal["none", "fp8", "nvfp4", "int8"],
+    calibrate: Callable[[], None],
+    logger
+) -> None:
+    """
+    Post-training quantize the pipeline's denoising network with NVIDIA ModelOpt.
+    
+    Must run before compile_pipeline. Activation ranges are calibrated by
+    running ``calibrate`` once through the fake-quantized model.
+    
+    Args:
+        pipeline: Loaded diffusers pipeline
+        mode: Quantization format ("none" disables quantization)
+        calibrate: Short pipeline call used as the calibration forward loop
+        logger: Logger of the owning client
+    """
+    if mode == "none":
+        return
+    
+    try:
+        import modelopt.torch.quantization as mtq
+    except ImportError:
+        logger.warning("nvidia-modelopt is not installed; skipping quantization")
+        return
+    
+    quant_config = getattr(mtq, QUANTIZATION_CONFIGS[mode])
+    for attribute in DENOISER_ATTRIBUTES:
+        module = getattr(pipeline, attribute, None)
+        if isinstance(module, torch.nn.Module):
+            mtq.quantize(module, quant_config, forward_loop=lambda _: calibrate())
+            logger.info(f"Quantized pipeline {attribute} to {mode}")
@@ -4,9 +4,15 @@ Provides video generation using SVD as an alternative to LTX-Video.
 """
 
 import asyncio
+import functools
+import itertools
+import secrets
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 import torch
 from PIL import Image
 import numpy as np
@@ -14,6 +20,17 @@ from loguru import logger
 
 from ..models.config import VEOConfig, VideoRequest, AspectRatio, PersonGeneration
 from ..utils.logger import get_logger
+from .pipeline_utils import (
+    HostFrameBuffer, attention_context, compile_pipeline, enable_memory_efficient_attention,
+    enable_sdpa_attention, enable_vae_tiling, is_cuda,
+    pipeline_dtype, quantize_pipeline
+)
+
+# Approximate VRAM needed to keep the whole fp16 SVD pipeline resident on the GPU
+SVD_VRAM_FOOTPRINT = 8 * 1024**3
+
+# Processed input images kept per client
+IMAGE_CACHE_SIZE = 16
 
 
 class SVDClient:
@@ -21,27 +38,102 @@ class SVDClient:
     Stable Video Diffusion client for video generation.
     """
     
-    def __init__(self, config: VEOConfig):
+    MODEL_NAME = "Wan-AI/Wan2.1-T2V-1.3B-Diffusers"
+    
+    # Loaded (quantized/compiled) pipelines shared by all clients, keyed by _pipeline_key()
+    _pipeline_cache: Dict[Tuple, Any] = {}
+    
+    # Guards the class-level caches; a thread lock, since clients may run on
+    # several event loops (CLI runners, generate_video_sync, PromptManager)
+    _cache_lock = threading.Lock()
+    
+    # One single-thread executor per cached pipeline, so calls on a shared
+    # pipeline are serialized and always made from the same host thread
+    _executors: Dict[Tuple, ThreadPoolExecutor] = {}
+    
+    # Output file numbering, shared by all clients (and GPUs) of the process
+    _run_id = int(time.time())
+    _video_counter = itertools.count()
+    
+    def __init__(self, config: VEOConfig, device: Optional[str] = None):
         """
         Initialize SVD client.
         
         Args:
             config: VEO configuration
+            device: Torch device to run on (defaults to "cuda" when available, else "cpu")
         """
         self.config = config
         self.logger = get_logger("svd.video")
         self.pipeline = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        
+        # Pinned staging buffer for decoded frames (reused across batches)
+        self._host_frames = HostFrameBuffer()
+        
+        # Output directories already created by this client
+        self._created_dirs: set = set()
+        
+        # Processed input images by (path, mtime, size), most recently used last
+        self._image_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        
+        # One client per GPU for multi-GPU requests; each client runs its pipeline
+        # on the pipeline's dedicated thread (see _get_executor), off the event loop
+        self._device_clients: Optional[List["SVDClient"]] = None
         
         self.logger.info(f"SVD client initialized on device: {self.device}")
     
+    def _pipeline_key(self) -> Tuple:
+        """
+        Get the cache key identifying an equivalent loaded pipeline.
+        """
+        return (
+            self.MODEL_NAME,
+            str(pipeline_dtype(self.device)),
+            self.device,
+            self.config.quantize,
+            self.config.compile_model,
+        )
+    
     async def initialize_pipeline(self):
         """
-        Initialize the SVD pipeline.
+        Initialize the SVD pipeline, reusing one already loaded by another client.
         """
         if self.pipeline is not None:
             return
         
+        # Loading (and quantization calibration / compile warm-up) takes minutes:
+        # run it on the pipeline's thread, which also replays the captured graphs
+        self.pipeline = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), self._get_or_load_pipeline
+        )
+    
+    def _get_or_load_pipeline(self) -> Any:
+        """
+        Get the cached pipeline for this client's key, loading it on a miss.
+        
+        Runs on the key's single-thread executor, so loads of one pipeline never
+        overlap; pipelines for other keys (e.g. other GPUs) load in parallel.
+        
+        Returns:
+            The shared pipeline
+        """
+        key = self._pipeline_key()
+        with self._cache_lock:
+            cached = self._pipeline_cache.get(key)
+        if cached is not None:
+            self.logger.info("Reusing cached SVD pipeline")
+            return cached
+        
+        self._load_pipeline()
+        with self._cache_lock:
+            self._pipeline_cache[key] = self.pipeline
+        return self.pipeline
+    
+    def _load_pipeline(self):
+        """
+        Load the SVD pipeline from disk and apply CUDA optimizations.
+        """
         try:
             from diffusers import StableVideoDiffusionPipeline
             
@@ -50,18 +142,36 @@ class SVDClient:
             try:
                 # Load the pipeline with optimizations
                 self.pipeline = StableVideoDiffusionPipeline.from_pretrained(
-                    "Wan-AI/Wan2.1-T2V-1.3B-Diffusers",
-                    torch_dtype=torch.float32,  # Always use float32 for CPU
-                    variant=None,  # No variant for CPU
+                    self.MODEL_NAME,
+                    torch_dtype=pipeline_dtype(self.device),  # fp16 on CUDA, fp32 on CPU
                     use_safetensors=True,
                     low_cpu_mem_usage=True
                 )
                 
-                # Move to device
-                self.pipeline = self.pipeline.to(self.device)
+                # Keep the pipeline resident on the GPU when it fits; CPU offload
+                # moves submodules back and forth on every forward pass
+                if not is_cuda(self.device):
+                    self.pipeline = self.pipeline.to(self.device)
+                elif self.config.low_vram:
+                    self.logger.info("Low VRAM mode: enabling sequential CPU offload")
+                    self.pipeline.enable_sequential_cpu_offload(device=self.device)
+                elif torch.cuda.mem_get_info(self.device)[0] >= SVD_VRAM_FOOTPRINT:
+                    self.pipeline = self.pipeline.to(self.device)
+                else:
+                    self.logger.info("Not enough free VRAM for the full pipeline: enabling model CPU offload")
+                    self.pipeline.enable_model_cpu_offload(device=self.device)
                 
-                # Enable memory efficient attention
-                self.pipeline.enable_model_cpu_offload()
+                if is_cuda(self.device):
+                    enable_vae_tiling(self.pipeline, self.logger)
+                    enable_sdpa_attention(self.pipeline, self.logger)
+                    if self.config.memory_efficient_attention:
+                        enable_memory_efficient_attention(self.pipeline, self.logger)
+                    
+                    # Quantize before compiling so Inductor sees the quantized graph
+                    quantize_pipeline(self.pipeline, self.config.quantize, self._calibration_pass, self.logger)
+                    if self.config.compile_model:
+                        # SVD always runs at 1024x576, so one compiled graph is reused
+                        compile_pipeline(self.pipeline, self.logger)
                 
                 self.logger.success("SVD pipeline loaded successfully")
                 
@@ -74,6 +184,16 @@ class SVDClient:
             self.logger.error(f"Failed to initialize SVD: {e}")
             self.pipeline = MockSVDPipeline()
     
+    def _calibration_pass(self) -> None:
+        """
+        Run a short image-to-video pass used to calibrate quantization ranges.
+        """
+        self.pipeline(
+            image=self._create_default_image(),
+            num_frames=14,
+            num_inference_steps=2,
+        )
+    
     async def generate_video_async(
         self, 
         request: VideoRequest,
@@ -95,32 +215,52 @@ class SVDClient:
             # Initialize pipeline if needed
             await self.initialize_pipeline()
             
-            if progress_callback:
-                progress_callback({"status": "initializing", "progress": 10})
+            self._notify(progress_callback, {"status": "initializing", "progress": 10})
+            
+            # Prepare generation parameters (image decoding runs off the event loop)
+            loop = asyncio.get_running_loop()
+            generation_params = await loop.run_in_executor(
+                self._get_executor(), self._prepare_generation_params, request
+            )
             
-            # Prepare generation parameters
-            generation_params = self._prepare_generation_params(request)
+            self._notify(progress_callback, {"status": "generating", "progress": 25})
             
-            if progress_callback:
-                progress_callback({"status": "generating", "progress": 25})
+            if request.number_of_videos > 1 and len(self._get_device_clients()) > 1:
+                video_paths = await self._generate_across_devices(
+                    request, generation_params, progress_callback
+                )
+                
+                self._notify(progress_callback, {"status": "completed", "progress": 100})
+                
+                self.logger.success(f"Generated {len(video_paths)} video(s) successfully")
+                return video_paths
             
-            # Generate videos
+            # Generate videos, all of a request's videos in one batched pipeline call
+            # (falls back to one video per call if the batch does not fit in GPU memory)
             video_paths = []
-            for i in range(request.number_of_videos):
-                if progress_callback:
-                    progress_callback({
-                        "status": "generating", 
-                        "progress": 25 + (i * 50 // request.number_of_videos)
-                    })
+            batch_size = request.number_of_videos
+            while len(video_paths) < request.number_of_videos:
+                start = len(video_paths)
+                count = min(batch_size, request.number_of_videos - start)
+                self._notify(progress_callback, {
+                    "status": "generating", 
+                    "progress": 25 + (start * 50 // request.number_of_videos)
+                })
                 
-                # Generate single video
-                video_path = await self._generate_single_video(
-                    request, generation_params, i
-                )
-                video_paths.append(video_path)
+                try:
+                    video_paths.extend(await loop.run_in_executor(
+                        self._get_executor(), self._generate_videos,
+                        request, generation_params, start, count,
+                        self._step_callback(progress_callback, generation_params, start, count, request.number_of_videos)
+                    ))
+                except torch.cuda.OutOfMemoryError:
+                    if count == 1:
+                        raise
+                    self.logger.warning(f"Out of GPU memory generating {count} videos at once, retrying one per call")
+                    torch.cuda.empty_cache()
+                    batch_size = 1
             
-            if progress_callback:
-                progress_callback({"status": "completed", "progress": 100})
+            self._notify(progress_callback, {"status": "completed", "progress": 100})
             
             self.logger.success(f"Generated {len(video_paths)} video(s) successfully")
             return video_paths
@@ -149,17 +289,43 @@ class SVDClient:
             "max_guidance_scale": 3.0,
             "motion_bucket_id": 127,
             "noise_aug_strength": 0.02,
+            "seed": secrets.randbits(32),
         }
         
         # Add image if provided
         if request.image_path:
-            params["image"] = self._load_image(request.image_path)
+            params["image"] = self._load_image_cached(request.image_path)
         else:
             # SVD requires an input image
             params["image"] = self._create_default_image()
         
         return params
     
+    def _load_image_cached(self, image_path: Path) -> Image.Image:
+        """
+        Load an input image, reusing the processed result while the file is unchanged.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            Processed image, as returned by _load_image
+        """
+        stat = image_path.stat()
+        key = (str(image_path), stat.st_mtime_ns, stat.st_size)
+        
+        image = self._image_cache.get(key)
+        if image is None:
+            image = self._load_image(image_path)
+            self._image_cache[key] = image
+            if len(self._image_cache) > IMAGE_CACHE_SIZE:
+                self._image_cache.popitem(last=False)
+        else:
+            self._image_cache.move_to_end(key)
+        
+        # PIL images are mutable: hand out a copy
+        return image.copy()
+    
     def _load_image(self, image_path: Path) -> Image.Image:
         """
         Load and process image for SVD.
@@ -171,14 +337,22 @@ class SVDClient:
             Processed PIL Image
         """
         try:
+            target_size = (1024, 576)
+            
             image = Image.open(image_path)
             
+            # Let JPEG decoders downscale while decoding (no-op for other formats)
+            image.draft('RGB', target_size)
+            
             # Convert to RGB if necessary
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             
-            # Resize to SVD requirements (1024x576)
-            image = image.resize((1024, 576), Image.Resampling.LANCZOS)
+            # Resize to SVD requirements (1024x576), skipping the LANCZOS
+            # pass when the image already has the right size; large sources are
+            # box-reduced by an integer factor first (reducing_gap)
+            if image.size != target_size:
+                image = image.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
             
             return image
             
@@ -191,93 +365,259 @@ class SVDClient:
         Create a default image for SVD when no input image is provided.
         
         Returns:
-            Default PIL Image
+            Default PIL Image (a copy of the cached conditioning image)
+        """
+        return _default_image().copy()
+    
+    def _get_device_clients(self) -> List["SVDClient"]:
+        """
+        Get one client per visible GPU, this client serving the first one.
+        
+        Returns:
+            Clients to spread a request's videos over (just this one on single-GPU/CPU hosts)
+        """
+        if self._device_clients is None:
+            self._device_clients = [self]
+            if is_cuda(self.device):
+                self._device_clients += [
+                    SVDClient(self.config, device=f"cuda:{index}")
+                    for index in range(1, torch.cuda.device_count())
+                ]
+        return self._device_clients
+    
+    async def _generate_across_devices(
+        self,
+        request: VideoRequest,
+        params: Dict[str, Any],
+        progress_callback: Optional[callable] = None
+    ) -> List[str]:
+        """
+        Generate a request's videos in parallel, one video at a time per GPU.
+        
+        Video indices are queued and each GPU's worker takes the next one as
+        soon as it is free, so faster devices pick up more of the work.
+        
+        Args:
+            request: Video generation request
+            params: Generation parameters
+            progress_callback: Optional progress callback
+            
+        Returns:
+            Paths to generated videos, in index order
+        """
+        clients = self._get_device_clients()
+        for client in clients:
+            await client.initialize_pipeline()
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in range(request.number_of_videos):
+            queue.put_nowait(index)
+        
+        loop = asyncio.get_running_loop()
+        results: Dict[int, str] = {}
+        
+        async def worker(client: "SVDClient"):
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                paths = await loop.run_in_executor(
+                    client._get_executor(), client._generate_videos, request, params, index, 1
+                )
+                results[index] = paths[0]
+                self._notify(progress_callback, {
+                    "status": "generating",
+                    "progress": 25 + (len(results) * 50 // request.number_of_videos)
+                })
+        
+        self.logger.info(f"Spreading {request.number_of_videos} videos over {len(clients)} GPUs")
+        await asyncio.gather(*(worker(client) for client in clients))
+        return [results[index] for index in range(request.number_of_videos)]
+    
+    def _attention_context(self):
+        """
+        Get the attention backend context for this client's pipeline calls.
+        """
+        return attention_context(self.config.memory_efficient_attention and is_cuda(self.device))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the single-thread executor this client's pipeline calls run on.
+        
+        Executors are shared under the _pipeline_key() of the cached pipeline,
+        so clients reusing one pipeline never run it from two threads at once.
+        """
+        key = self._pipeline_key()
+        with self._cache_lock:
+            executor = self._executors.get(key)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"svd-{self.device}")
+                self._executors[key] = executor
+        return executor
+    
+    def _ensure_dir(self, directory: Path) -> None:
+        """
+        Create an output directory once per client instead of once per video.
+        
+        Args:
+            directory: Directory to create
+        """
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+    
+    @staticmethod
+    def _notify(progress_callback: Optional[callable], event: Dict[str, Any]) -> None:
+        """
+        Schedule a progress event on the running loop instead of calling back inline.
+        
+        The callback runs on the next loop iteration, so slow callbacks (e.g. a
+        websocket push) never delay generation.
+        
+        Args:
+            progress_callback: Progress callback of the request (None disables reporting)
+            event: Progress event
+        """
+        if progress_callback is not None:
+            asyncio.get_running_loop().call_soon(progress_callback, event)
+    
+    def _step_callback(
+        self,
+        progress_callback: Optional[callable],
+        params: Dict[str, Any],
+        first_index: int,
+        count: int,
+        total: int
+    ) -> Optional[callable]:
+        """
+        Build a denoising step callback that reports progress back on the event loop.
+        
+        Args:
+            progress_callback: Progress callback of the request (None disables reporting)
+            params: Generation parameters
+            first_index: Index of the first video in the batch
+            count: Number of videos in the batch
+            total: Number of videos in the request
+            
+        Returns:
+            Callback for the pipeline's ``callback_on_step_end`` argument, or None
         """
-        # Create a simple gradient image
-        width, height = 1024, 576
-        image = Image.new('RGB', (width, height), color=(100, 150, 200))
+        if progress_callback is None:
+            return None
         
-        # Add some simple pattern
-        from PIL import ImageDraw
-        draw = ImageDraw.Draw(image)
+        loop = asyncio.get_running_loop()
+        steps = params["num_inference_steps"]
         
-        # Draw some circles
-        for i in range(5):
-            x = (i + 1) * width // 6
-            y = height // 2
-            radius = 50 + i * 10
-            draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
-                        fill=(255-i*50, 100+i*30, 150+i*20))
+        def on_step_end(pipeline, step, timestep, callback_kwargs):
+            done = first_index + count * (step + 1) / steps
+            loop.call_soon_threadsafe(progress_callback, {
+                "status": "generating",
+                "progress": 25 + int(done * 50 / total)
+            })
+            return callback_kwargs
         
-        return image
+        return on_step_end
     
-    async def _generate_single_video(
+    def _generate_videos(
         self, 
         request: VideoRequest, 
         params: Dict[str, Any], 
-        video_index: int
-    ) -> str:
+        first_index: int,
+        count: int,
+        step_callback: Optional[callable] = None
+    ) -> List[str]:
         """
-        Generate a single video using SVD.
+        Generate a batch of videos with a single SVD pipeline call.
+        
+        Runs synchronously; callers dispatch it to the client's executor.
         
         Args:
             request: Video generation request
             params: Generation parameters
-            video_index: Index of video being generated
+            first_index: Index of the first video in the batch (offsets the seed)
+            count: Number of videos to generate in this call
+            step_callback: Optional per-denoising-step callback
             
         Returns:
-            Path to generated video
+            Paths to generated videos
         """
-        # Generate unique filename
-        timestamp = int(time.time())
-        video_filename = f"svd_video_{timestamp}_{video_index}.mp4"
-        video_path = self.config.output_dir / video_filename
+        # Generate unique filenames
+        video_paths = [
+            self.config.output_dir / f"svd_video_{self._run_id}_{next(self._video_counter)}.mp4"
+            for _ in range(count)
+        ]
         
         try:
-            # Generate video using SVD pipeline
-            video_frames = self.pipeline(
-                image=params["image"],
-                num_frames=params["num_frames"],
-                num_inference_steps=params["num_inference_steps"],
-                min_guidance_scale=params["min_guidance_scale"],
-                max_guidance_scale=params["max_guidance_scale"],
-                motion_bucket_id=params["motion_bucket_id"],
-                noise_aug_strength=params["noise_aug_strength"],
-                generator=torch.Generator().manual_seed(int(time.time()) % 2**32),
-            ).frames[0]
-            
-            # Save video
-            self._save_video(video_frames, video_path)
-            
-            self.logger.info(f"Generated video: {video_path}")
-            return f"file://{video_path.absolute()}"
+            # Generate videos using SVD pipeline; noise is sampled on the
+            # pipeline's device and autograd bookkeeping is disabled
+            # (offset by the first index so separate calls never repeat the same noise)
+            generator = torch.Generator(device=self.device).manual_seed(
+                (params["seed"] + first_index) % 2**32
+            )
+            # On CUDA keep decoded frames as GPU tensors and stage them through pinned memory
+            output_type = "pt" if is_cuda(self.device) else "pil"
+            with torch.inference_mode(), self._attention_context():
+                videos = self.pipeline(
+                    image=params["image"],
+                    num_frames=params["num_frames"],
+                    num_inference_steps=params["num_inference_steps"],
+                    min_guidance_scale=params["min_guidance_scale"],
+                    max_guidance_scale=params["max_guidance_scale"],
+                    motion_bucket_id=params["motion_bucket_id"],
+                    noise_aug_strength=params["noise_aug_strength"],
+                    num_videos_per_prompt=count,
+                    output_type=output_type,
+                    callback_on_step_end=step_callback,
+                    generator=generator,
+                ).frames
+            
+            videos = self._host_frames.to_numpy(videos)
+            
+            # Save videos (the pipeline returns one frame sequence per video)
+            for video_frames, video_path in zip(videos, video_paths):
+                self._save_video(video_frames, video_path)
+                self.logger.info(f"Generated video: {video_path}")
+            return [f"file://{video_path.absolute()}" for video_path in video_paths]
             
+        except torch.cuda.OutOfMemoryError:
+            raise
         except Exception as e:
-            self.logger.error(f"Failed to generate video {video_index}: {e}")
+            self.logger.error(f"Failed to generate videos {first_index}-{first_index + count - 1}: {e}")
             raise
     
-    def _save_video(self, frames: List[np.ndarray], output_path: Path):
+    def _save_video(self, frames: np.ndarray, output_path: Path):
         """
         Save video frames to MP4 file.
         
         Args:
-            frames: List of video frames as numpy arrays
+            frames: (T, H, W, 3) uint8 RGB frames (a list of frames is stacked once)
             output_path: Output file path
         """
         try:
             import imageio
             
             # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Save video using imageio
-            imageio.mimsave(
-                str(output_path),
-                frames,
-                fps=3,  # SVD generates at ~3 FPS
-                codec='libx264',
-                quality=8
-            )
+            self._ensure_dir(output_path.parent)
+            
+            # Save video using imageio, from one (T, H, W, 3) buffer
+            def write():
+                imageio.mimsave(
+                    str(output_path),
+                    np.asarray(frames),
+                    fps=3,  # SVD generates at ~3 FPS
+                    codec='libx264',
+                    quality=8
+                )
+            
+            try:
+                write()
+            except FileNotFoundError:
+                # The cached directory may have been removed since it was created
+                self._created_dirs.discard(output_path.parent)
+                self._ensure_dir(output_path.parent)
+                write()
             
             self.logger.info(f"Video saved: {output_path}")
             
@@ -305,12 +645,39 @@ class SVDClient:
         }
 
 
+@functools.lru_cache(maxsize=1)
+def _default_image() -> Image.Image:
+    """
+    Draw the static default SVD conditioning image once per process.
+    
+    Returns:
+        Default PIL Image
+    """
+    # Create a simple gradient image
+    width, height = 1024, 576
+    image = Image.new('RGB', (width, height), color=(100, 150, 200))
+    
+    # Add some simple pattern
+    from PIL import ImageDraw
+    draw = ImageDraw.Draw(image)
+    
+    # Draw some circles
+    for i in range(5):
+        x = (i + 1) * width // 6
+        y = height // 2
+        radius = 50 + i * 10
+        draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
+                    fill=(255-i*50, 100+i*30, 150+i*20))
+    
+    return image
+
+
 class MockSVDPipeline:
     """
     Mock SVD pipeline for when the real model is not available.
     """
     
-    def __call__(self, **kwargs):
-        # Return mock frames
-        frames = [np.random.randint(0, 255, (576, 1024, 3), dtype=np.uint8) for _ in range(25)]
+    def __call__(self, num_videos_per_prompt: int = 1, **kwargs):
+        # Return mock frames as one contiguous (videos, T, H, W, 3) uint8 buffer
+        frames = np.random.randint(0, 255, (num_videos_per_prompt, 25, 576, 1024, 3), dtype=np.uint8)
         return type('MockResult', (), {'frames': frames})()
@@ -4,9 +4,14 @@ Provides interface to SVD and LTX-Video for video generation.
 """
 
 import asyncio
+import importlib.util
+import os
+import shutil
 import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any
+import aiofiles
+import aiofiles.os
 from loguru import logger
 
 from ..models.config import VEOConfig, VideoRequest, AspectRatio, PersonGeneration
@@ -14,6 +19,16 @@ from ..utils.logger import get_logger
 from .ltx_video_client import LTXVideoClient
 from .svd_client import SVDClient
 
+# Keep-alive connections kept open for HTTP video downloads
+HTTP_POOL_SIZE = 100
+
+# Read/write granularity for HTTP video downloads (1 MiB)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# After this many consecutive SVD failures, requests go straight to LTX-Video
+SVD_FAILURE_THRESHOLD = 3
+SVD_COOLDOWN_SECONDS = 60.0
+
 
 class VideoGeneratorAPI:
     """
@@ -34,8 +49,47 @@ class VideoGeneratorAPI:
         self.ltx_client = LTXVideoClient(config)
         self.svd_client = SVDClient(config)
         
+        # SVD circuit breaker: consecutive failures and time.monotonic() until SVD is retried
+        self._svd_failures = 0
+        self._svd_cooldown_until = 0.0
+        
+        # Shared HTTP client for downloads, created on first use
+        self._http_client = None
+        
+        # Download directories already created by this instance
+        self._created_dirs: set = set()
+        
         self.logger.info("Video generation API initialized with SVD and LTX-Video")
     
+    def _get_http_client(self):
+        """
+        Get the pooled HTTP client, creating it on first use.
+        
+        Returns:
+            Shared httpx.AsyncClient with keep-alive connection pooling (and
+            HTTP/2 multiplexing when the h2 package is installed)
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            import httpx
+            
+            self._http_client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_SIZE,
+                    max_keepalive_connections=HTTP_POOL_SIZE
+                )
+            )
+        return self._http_client
+    
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP client. Must run on the loop that used it.
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
     async def generate_video_async(
         self, 
         request: VideoRequest,
@@ -44,6 +98,9 @@ class VideoGeneratorAPI:
         """
         Generate video using SVD (primary) or LTX-Video (fallback).
         
+        While SVD is cooling down after repeated failures, LTX-Video is used
+        directly instead of paying for a failing SVD attempt on every request.
+        
         Args:
             request: Video generation request
             progress_callback: Optional progress callback
@@ -54,15 +111,28 @@ class VideoGeneratorAPI:
         self.logger.info(f"Starting video generation: {request.prompt[:50]}...")
         
         try:
+            if time.monotonic() < self._svd_cooldown_until:
+                video_uris = await self.ltx_client.generate_video_async(request, progress_callback)
+                self.logger.success(f"LTX-Video generated {len(video_uris)} video(s) successfully")
+                return video_uris
+            
             # Try SVD first (most reliable)
             try:
                 self.logger.info("Attempting SVD generation...")
                 video_uris = await self.svd_client.generate_video_async(request, progress_callback)
+                self._svd_failures = 0
                 self.logger.success(f"SVD generated {len(video_uris)} video(s) successfully")
                 return video_uris
                 
             except Exception as svd_error:
                 self.logger.warning(f"SVD failed: {svd_error}")
+                self._svd_failures += 1
+                if self._svd_failures >= SVD_FAILURE_THRESHOLD:
+                    self._svd_cooldown_until = time.monotonic() + SVD_COOLDOWN_SECONDS
+                    self.logger.warning(
+                        f"SVD failed {self._svd_failures} times in a row; "
+                        f"using LTX-Video for the next {SVD_COOLDOWN_SECONDS:.0f}s"
+                    )
                 self.logger.info("Falling back to LTX-Video...")
                 
                 # Fallback to LTX-Video
@@ -87,34 +157,92 @@ class VideoGeneratorAPI:
         """
         try:
             if video_uri.startswith("file://"):
-                # Local file, just copy
+                # Local file, just link or copy
                 source_path = Path(video_uri[7:])  # Remove file://
                 if source_path.exists():
-                    import shutil
-                    shutil.copy2(source_path, local_path)
+                    if source_path.resolve() != local_path.resolve():
+                        await asyncio.to_thread(self._link_or_copy, source_path, local_path)
                     self.logger.info(f"Copied video: {source_path} -> {local_path}")
                     return True
                 else:
                     self.logger.error(f"Source file not found: {source_path}")
                     return False
             else:
-                # HTTP download
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(video_uri)
+                # HTTP download over the pooled keep-alive connections, streamed
+                # to disk chunk by chunk instead of buffering the whole body
+                await self._ensure_dir(local_path.parent)
+                async with self._get_http_client().stream("GET", video_uri) as response:
                     response.raise_for_status()
                     
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(local_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    self.logger.info(f"Downloaded video: {video_uri} -> {local_path}")
-                    return True
+                    try:
+                        f = await aiofiles.open(local_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE)
+                    except FileNotFoundError:
+                        # The cached directory may have been removed since it was created
+                        self._created_dirs.discard(local_path.parent)
+                        await self._ensure_dir(local_path.parent)
+                        f = await aiofiles.open(local_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE)
+                    async with f:
+                        async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+                
+                self.logger.info(f"Downloaded video: {video_uri} -> {local_path}")
+                return True
                     
         except Exception as e:
             self.logger.error(f"Failed to download video {video_uri}: {str(e)}")
             return False
     
+    async def _ensure_dir(self, directory: Path) -> None:
+        """
+        Create a download directory once per client instead of once per video.
+        
+        Args:
+            directory: Directory to create
+        """
+        if directory not in self._created_dirs:
+            await aiofiles.os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+    
+    @staticmethod
+    def _link_or_copy(source_path: Path, local_path: Path) -> None:
+        """
+        Hard-link a local video into place, copying its contents if linking fails.
+        
+        Args:
+            source_path: Existing video file
+            local_path: Destination path
+        """
+        try:
+            os.link(source_path, local_path)
+        except OSError:
+            # Cross-device, existing destination, or no hard link support:
+            # copyfile uses the kernel's sendfile/copy_file_range fast path
+            shutil.copyfile(source_path, local_path)
+    
+    async def download_videos(self, video_uris: List[str], local_paths: List[Path]) -> List[bool]:
+        """
+        Download several videos concurrently over the shared HTTP client.
+        
+        At most config.max_concurrent_downloads transfers run at once.
+        
+        Args:
+            video_uris: Video URIs (file:// or http://)
+            local_paths: Local path for each URI
+            
+        Returns:
+            download_video result for each URI, in order
+        """
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_downloads)
+        
+        async def download_bounded(video_uri: str, local_path: Path) -> bool:
+            async with semaphore:
+                return await self.download_video(video_uri, local_path)
+        
+        return list(await asyncio.gather(*(
+            download_bounded(video_uri, local_path)
+            for video_uri, local_path in zip(video_uris, local_paths)
+        )))
+    
     async def check_operation_status(self, operation_id: str) -> Dict[str, Any]:
         """
         Check operation status (not applicable for local generation).
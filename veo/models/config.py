@@ -2,15 +2,40 @@
 Configuration models for VEO video generation.
 """
 
+import functools
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Literal
-from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Optional, Literal, TypedDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 import os
-from dotenv import load_dotenv
+
+# Set once .env has been loaded; inherited by subprocesses, which then skip reparsing it
+DOTENV_LOADED_ENV = "_VEO_DOTENV_LOADED"
+
+# Set to "1" in deployments that provide the real environment, to never read .env
+SKIP_DOTENV_ENV = "VEO_SKIP_DOTENV"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_once() -> None:
+    """Load .env into the environment at most once per process tree."""
+    if os.environ.get(DOTENV_LOADED_ENV) or os.environ.get(SKIP_DOTENV_ENV) == "1":
+        return
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        # python-dotenv is optional: without it only the real environment is read
+        return
+    load_dotenv()
+    os.environ[DOTENV_LOADED_ENV] = "1"
+
 
 # Load environment variables
-load_dotenv()
+_load_env_once()
+
+# Prompt length bounds enforced by VideoRequest
+PROMPT_MIN_LENGTH = 10
+PROMPT_MAX_LENGTH = 10000
 
 
 class AspectRatio(str, Enum):
@@ -26,9 +51,48 @@ class PersonGeneration(str, Enum):
     DONT_ALLOW = "dont_allow"
 
 
+def _enum_member(members: dict, enum_cls: type, value: str) -> Enum:
+    """Look up an enum member by value; unknown values raise through the Enum constructor."""
+    member = members.get(value)
+    return member if member is not None else enum_cls(value)
+
+
+# Enum members by value, for lookups without going through Enum.__call__
+_ASPECT_RATIOS = {member.value: member for member in AspectRatio}
+_PERSON_GENERATIONS = {member.value: member for member in PersonGeneration}
+
+
+class _EnvPayload(TypedDict, total=False):
+    """VEOConfig field values collected by VEOConfig.from_env."""
+    huggingface_token: Optional[str]
+    model: str
+    device: str
+    low_memory: bool
+    quality: str
+    compile_model: bool
+    quantize: str
+    low_vram: bool
+    memory_efficient_attention: bool
+    default_aspect_ratio: AspectRatio
+    default_duration: int
+    default_number_of_videos: int
+    default_person_generation: PersonGeneration
+    max_concurrent_operations: int
+    max_concurrent_downloads: int
+    requests_per_minute: int
+    retry_attempts: int
+    retry_delay: int
+    output_dir: Path
+    gcs_bucket: Optional[str]
+    log_level: str
+    log_format: str
+
+
 class VEOConfig(BaseModel):
     """Main configuration for VEO client."""
     
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     # Hugging Face Configuration
     huggingface_token: Optional[str] = Field(None, description="Hugging Face token")
     
@@ -37,6 +101,10 @@ class VEOConfig(BaseModel):
     device: str = Field("auto", description="Device to use (cuda, cpu, auto)")
     low_memory: bool = Field(True, description="Use low memory mode")
     quality: str = Field("high", description="Generation quality (high, medium, low)")
+    compile_model: bool = Field(False, description="Compile pipelines with torch.compile (CUDA only)")
+    quantize: Literal["none", "fp8", "nvfp4", "int8"] = Field("none", description="Denoiser quantization via NVIDIA ModelOpt (CUDA only)")
+    low_vram: bool = Field(False, description="Use sequential CPU offload for GPUs with little memory")
+    memory_efficient_attention: bool = Field(False, description="Use xFormers or fused-only SDPA attention (CUDA only)")
     
     # Default Settings
     default_aspect_ratio: AspectRatio = Field(AspectRatio.LANDSCAPE, description="Default aspect ratio")
@@ -46,6 +114,8 @@ class VEOConfig(BaseModel):
     
     # Performance Settings
     max_concurrent_operations: int = Field(3, ge=1, le=10, description="Max concurrent operations")
+    requests_per_minute: int = Field(60, ge=1, le=6000, description="Max generation requests started per minute")
+    max_concurrent_downloads: int = Field(16, ge=1, le=100, description="Max concurrent video downloads")
     retry_attempts: int = Field(3, ge=1, le=10, description="Number of retry attempts")
     retry_delay: int = Field(30, ge=1, le=300, description="Delay between retries in seconds")
     
@@ -57,39 +127,58 @@ class VEOConfig(BaseModel):
     log_level: str = Field("INFO", description="Logging level")
     log_format: Literal["json", "text"] = Field("text", description="Log format")
     
-    @validator('output_dir')
-    def create_output_dir(cls, v):
+    @field_validator('output_dir', mode='after')
+    @classmethod
+    def create_output_dir(cls, v: Path) -> Path:
         """Ensure output directory exists."""
         v.mkdir(parents=True, exist_ok=True)
         return v
     
     @classmethod
     def from_env(cls) -> 'VEOConfig':
-        """Create config from environment variables."""
-        return cls(
-            huggingface_token=os.getenv("HUGGINGFACE_TOKEN"),
-            model=os.getenv("VEO_MODEL", "Wan-AI/Wan2.1-T2V-1.3B-Diffusers"),
-            device=os.getenv("VEO_DEVICE", "auto"),
-            low_memory=os.getenv("VEO_LOW_MEMORY", "true").lower() == "true",
-            quality=os.getenv("VEO_QUALITY", "high"),
-            default_aspect_ratio=AspectRatio(os.getenv("VEO_DEFAULT_ASPECT_RATIO", "16:9")),
-            default_duration=int(os.getenv("VEO_DEFAULT_DURATION", "8")),
-            default_number_of_videos=int(os.getenv("VEO_DEFAULT_COUNT", "1")),
-            default_person_generation=PersonGeneration(os.getenv("VEO_PERSON_GENERATION", "allow_adult")),
-            max_concurrent_operations=int(os.getenv("VEO_MAX_CONCURRENT", "3")),
-            retry_attempts=int(os.getenv("VEO_RETRY_ATTEMPTS", "3")),
-            retry_delay=int(os.getenv("VEO_REQUEST_DELAY", "30")),
-            output_dir=Path(os.getenv("VEO_OUTPUT_DIR", "output/videos")),
-            gcs_bucket=os.getenv("VEO_GCS_BUCKET"),
-            log_level=os.getenv("VEO_LOG_LEVEL", "INFO"),
-            log_format=os.getenv("VEO_LOG_FORMAT", "text")
-        )
+        """
+        Create config from environment variables (read from one snapshot of os.environ).
+        
+        Values are cast explicitly below and then validated, so out-of-range
+        or unknown settings (e.g. VEO_MAX_CONCURRENT=0) fail here instead of
+        deep inside the clients.
+        """
+        env = dict(os.environ)
+        output_dir = Path(env.get("VEO_OUTPUT_DIR", "output/videos"))
+        
+        payload: _EnvPayload = {
+            "huggingface_token": env.get("HUGGINGFACE_TOKEN"),
+            "model": env.get("VEO_MODEL", "Wan-AI/Wan2.1-T2V-1.3B-Diffusers"),
+            "device": env.get("VEO_DEVICE", "auto"),
+            "low_memory": env.get("VEO_LOW_MEMORY", "true").lower() == "true",
+            "quality": env.get("VEO_QUALITY", "high"),
+            "compile_model": env.get("VEO_COMPILE_MODEL", "false").lower() == "true",
+            "quantize": env.get("VEO_QUANTIZE", "none").lower(),
+            "low_vram": env.get("VEO_LOW_VRAM", "false").lower() == "true",
+            "memory_efficient_attention": env.get("VEO_MEMORY_EFFICIENT_ATTENTION", "false").lower() == "true",
+            "default_aspect_ratio": _enum_member(_ASPECT_RATIOS, AspectRatio, env.get("VEO_DEFAULT_ASPECT_RATIO", "16:9")),
+            "default_duration": int(env.get("VEO_DEFAULT_DURATION", "8")),
+            "default_number_of_videos": int(env.get("VEO_DEFAULT_COUNT", "1")),
+            "default_person_generation": _enum_member(_PERSON_GENERATIONS, PersonGeneration, env.get("VEO_PERSON_GENERATION", "allow_adult")),
+            "max_concurrent_operations": int(env.get("VEO_MAX_CONCURRENT", "3")),
+            "max_concurrent_downloads": int(env.get("VEO_MAX_CONCURRENT_DOWNLOADS", "16")),
+            "requests_per_minute": int(env.get("VEO_REQUESTS_PER_MINUTE", "60")),
+            "retry_attempts": int(env.get("VEO_RETRY_ATTEMPTS", "3")),
+            "retry_delay": int(env.get("VEO_REQUEST_DELAY", "30")),
+            "output_dir": output_dir,
+            "gcs_bucket": env.get("VEO_GCS_BUCKET"),
+            "log_level": env.get("VEO_LOG_LEVEL", "INFO"),
+            "log_format": env.get("VEO_LOG_FORMAT", "text")
+        }
+        return cls.model_validate(payload)
 
 
 class VideoRequest(BaseModel):
     """Request model for video generation."""
     
-    prompt: str = Field(..., min_length=10, max_length=10000, description="Video generation prompt")
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
+    prompt: str = Field(..., min_length=PROMPT_MIN_LENGTH, max_length=PROMPT_MAX_LENGTH, description="Video generation prompt")
     image_path: Optional[Path] = Field(None, description="Path to input image")
     
     # Video Settings
@@ -105,16 +194,35 @@ class VideoRequest(BaseModel):
     output_gcs_uri: Optional[str] = Field(None, description="GCS URI for output")
     output_filename: Optional[str] = Field(None, description="Custom output filename")
     
-    @validator('image_path')
-    def validate_image_path(cls, v):
+    @field_validator('image_path', mode='after')
+    @classmethod
+    def validate_image_path(cls, v: Optional[Path]) -> Optional[Path]:
         """Validate image path exists if provided."""
         if v and not v.exists():
             raise ValueError(f"Image file not found: {v}")
         return v
     
-    @validator('output_gcs_uri')
-    def validate_gcs_uri(cls, v):
+    @field_validator('output_gcs_uri', mode='after')
+    @classmethod
+    def validate_gcs_uri(cls, v: Optional[str]) -> Optional[str]:
         """Validate GCS URI format."""
-        if v and not v.startswith("gs://"):
+        if v and v[:5] != "gs://":
             raise ValueError("GCS URI must start with 'gs://'")
         return v
+    
+    @classmethod
+    def validate_batch(cls, data: List[Dict[str, Any]]) -> List['VideoRequest']:
+        """
+        Validate several requests in one pydantic-core call.
+        
+        Args:
+            data: Request field values, one dict per request
+            
+        Returns:
+            Validated requests, in input order
+        """
+        return _VIDEO_REQUEST_LIST_ADAPTER.validate_python(data)
+
+
+# Built once: validates whole request batches without per-request constructor calls
+_VIDEO_REQUEST_LIST_ADAPTER = TypeAdapter(List[VideoRequest])
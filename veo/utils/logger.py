@@ -2,12 +2,36 @@
 Logging utilities for VEO.
 """
 
+import functools
 import sys
 from pathlib import Path
-from loguru import logger
 from typing import Literal, Optional
 
 
+@functools.lru_cache(maxsize=1)
+def _loguru():
+    """Import loguru on first use instead of at module import."""
+    from loguru import logger
+    return logger
+
+
+# Handler formats, built once (the JSON format is the "text" field of each serialized record)
+JSON_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} | {message}"
+TEXT_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>"
+
+# (format, serialize) per format_type
+HANDLER_FORMATS = {
+    "json": (JSON_FORMAT, True),
+    "text": (TEXT_FORMAT, False),
+}
+
+# (level, format_type, log_file) of the handlers currently installed by setup_logger
+_active_config: Optional[tuple] = None
+
+# Whether the custom SUCCESS/PROGRESS levels have been registered
+_levels_added = False
+
+
 def setup_logger(
     level: str = "INFO",
     format_type: Literal["json", "text"] = "text",
@@ -20,24 +44,35 @@ def setup_logger(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_type: Log format type (json or text)
         log_file: Optional log file path
+    
+    Calling it again with the same arguments keeps the installed handlers.
     """
+    global _active_config, _levels_added
+    
+    logger = _loguru()
+    
+    config = (level, format_type, log_file)
+    if config == _active_config:
+        return logger
+    
     # Remove default handler
     logger.remove()
     
-    # Choose format
-    if format_type == "json":
-        log_format = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} | {message}"
-    else:
-        log_format = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>"
+    # Choose format; JSON records are serialized by loguru itself, without color markup
+    log_format, serialize = HANDLER_FORMATS[format_type]
+    
+    # Extended tracebacks with local variable values only when debugging
+    debug = level.upper() == "DEBUG"
     
     # Console handler
     logger.add(
         sys.stdout,
         format=log_format,
         level=level,
-        colorize=format_type == "text",
-        backtrace=True,
-        diagnose=True
+        colorize=not serialize,
+        serialize=serialize,
+        backtrace=debug,
+        diagnose=debug
     )
     
     # File handler (if specified)
@@ -50,24 +85,34 @@ def setup_logger(
             rotation="10 MB",
             retention="7 days",
             compression="zip",
-            backtrace=True,
-            diagnose=True
+            serialize=serialize,
+            backtrace=debug,
+            diagnose=debug
         )
     
     # Add custom levels (only if they don't exist)
-    try:
-        logger.level("SUCCESS", no=25, color="<green>")
-    except ValueError:
-        pass  # Level already exists
-    
-    try:
-        logger.level("PROGRESS", no=15, color="<blue>")
-    except ValueError:
-        pass  # Level already exists
+    if not _levels_added:
+        try:
+            logger.level("SUCCESS", no=25, color="<green>")
+        except ValueError:
+            pass  # Level already exists
+        
+        try:
+            logger.level("PROGRESS", no=15, color="<blue>")
+        except ValueError:
+            pass  # Level already exists
+        _levels_added = True
     
+    _active_config = config
     return logger
 
 
 def get_logger(name: str = "veo"):
-    """Get logger instance for a specific module."""
-    return logger.bind(name=name)
+    """
+    Get logger instance for a specific module.
+    
+    The logger is bound with opt(lazy=True): callables passed as format
+    arguments are only called when the record passes the level filter, e.g.
+    ``logger.debug("State: {}", lambda: expensive_summary())``.
+    """
+    return _loguru().bind(name=name).opt(lazy=True)